@@ -7,17 +7,24 @@ Run this to automatically format your Python code.
 import os
 import subprocess
 import sys
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 
-def run_command(command, description):
-    """Run a command and return success status."""
+def run_command(command, description, capture=True):
+    """Run a command (given as an argv list) and return success status.
+
+    With capture=False stdout is sent to DEVNULL instead of being piped and decoded.
+    """
     print(f"🔧 {description}...")
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        stdout = subprocess.PIPE if capture else subprocess.DEVNULL
+        result = subprocess.run(
+            command, stdout=stdout, stderr=subprocess.PIPE, text=True
+        )
         if result.returncode == 0:
             print(f"✅ {description} completed successfully")
-            if result.stdout.strip():
+            if capture and result.stdout.strip():
                 print(f"Output: {result.stdout.strip()}")
             return True
         else:
@@ -30,13 +37,139 @@ def run_command(command, description):
         return False
 
 
+def _black_settings():
+    """Project root and parsed [tool.black] settings, found the way black finds them."""
+    import black
+
+    root, _ = black.find_project_root((".",))
+    pyproject = root / "pyproject.toml"
+    config = black.parse_pyproject_toml(str(pyproject)) if pyproject.is_file() else {}
+    return root, config
+
+
+def black_mode(config):
+    """Build the black Mode from [tool.black], with black's own defaults."""
+    import black
+
+    return black.Mode(
+        target_versions={
+            black.TargetVersion[version.upper()]
+            for version in config.get("target_version", ())
+        },
+        line_length=config.get("line_length", black.DEFAULT_LINE_LENGTH),
+        string_normalization=not config.get("skip_string_normalization", False),
+        magic_trailing_comma=not config.get("skip_magic_trailing_comma", False),
+        preview=config.get("preview", False),
+    )
+
+
+def collect_python_files(root, config):
+    """Collect the files black would format from the project root.
+
+    Uses black's own source discovery, so its default excludes, .gitignore and
+    the include/exclude settings in pyproject.toml all apply.
+    """
+    import black
+
+    def pattern(key):
+        value = config.get(key)
+        return black.re_compile_maybe_verbose(value) if value else None
+
+    return black.get_sources(
+        root=root,
+        src=(str(root),),
+        quiet=True,
+        verbose=False,
+        include=pattern("include")
+        or black.re_compile_maybe_verbose(black.DEFAULT_INCLUDES),
+        exclude=pattern("exclude"),
+        extend_exclude=pattern("extend_exclude"),
+        force_exclude=pattern("force_exclude"),
+        report=black.Report(quiet=True),
+        stdin_filename=None,
+    )
+
+
+def _format_file(path, mode):
+    """Format a single file in place; returns True if it changed, None on error."""
+    import black
+
+    try:
+        return black.format_file_in_place(
+            path, fast=False, mode=mode, write_back=black.WriteBack.YES
+        )
+    except Exception as e:
+        print(f"error: cannot format {path}: {e}")
+        return None
+
+
+def run_black(files, mode):
+    """Format files in-process with black, fanned out over a process pool."""
+    print("🔧 Black formatting...")
+    try:
+        paths = sorted(files)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            results = list(pool.map(_format_file, paths, [mode] * len(paths)))
+        changed = sum(result is True for result in results)
+        failed = sum(result is None for result in results)
+        summary = (
+            f"{changed} reformatted, {len(results) - changed - failed} unchanged, "
+            f"{failed} failed"
+        )
+        if failed == 0:
+            print("✅ Black formatting completed successfully")
+            print(f"Output: {summary}")
+            return True
+        else:
+            print("⚠️ Black formatting completed with warnings")
+            print(f"Warnings: {summary}")
+            return False
+    except Exception as e:
+        print(f"❌ Black formatting failed: {str(e)}")
+        return False
+
+
+@lru_cache(maxsize=None)
+def _isort_config():
+    """Build the isort config from pyproject.toml once per worker process."""
+    import isort
+
+    return isort.Config(settings_path=os.getcwd(), quiet=True)
+
+
+def _sort_imports(path):
+    """Sort the imports of a single file in place; returns True if it changed."""
+    import isort
+
+    return isort.file(path, config=_isort_config())
+
+
+def run_isort(files):
+    """Sort imports in-process with isort, fanned out over a process pool."""
+    print("🔧 Import sorting...")
+    try:
+        # Honour isort's own skip settings on top of black's file list
+        config = _isort_config()
+        files = [path for path in files if not config.is_skipped(path)]
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            changed = sum(pool.map(_sort_imports, sorted(files)))
+        print("✅ Import sorting completed successfully")
+        print(f"Output: {changed} of {len(files)} files re-sorted")
+        return True
+    except Exception as e:
+        print(f"❌ Import sorting failed: {str(e)}")
+        return False
+
+
 def main():
     """Main formatting function."""
     print("🎨 Fixing Code Formatting Issues")
     print("=" * 40)
     
-    # Check if we're in the right directory
-    if not Path("src").exists() or not Path("tests").exists():
+    # Check if we're in the right directory (one directory listing, no per-path stat)
+    with os.scandir(".") as entries:
+        root_entries = {entry.name for entry in entries}
+    if "src" not in root_entries or "tests" not in root_entries:
         print("❌ Please run this script from the project root directory")
         print("   (where src/ and tests/ directories are located)")
         return 1
@@ -44,43 +177,27 @@ def main():
     # Install formatting tools
     print("\n📦 Installing formatting tools...")
     install_commands = [
-        "pip install black isort flake8",
+        ["pip", "install", "black", "isort", "flake8"],
     ]
     
     for cmd in install_commands:
-        run_command(cmd, f"Installing tools: {cmd}")
+        run_command(cmd, f"Installing tools: {' '.join(cmd)}", capture=False)
+    
+    # Collect the file list once and share it between both formatters
+    root, black_config = _black_settings()
+    python_files = collect_python_files(root, black_config)
     
     # Run Black formatter
     print("\n🎨 Running Black code formatter...")
-    black_commands = [
-        "black src/ tests/ --line-length=88",
-        "black . --line-length=88 --extend-exclude='/(\.git|\.venv|venv|\.pytest_cache|__pycache__|\.mypy_cache)/'",
-    ]
-    
-    for cmd in black_commands:
-        run_command(cmd, "Black formatting")
+    black_ok = run_black(python_files, black_mode(black_config))
     
     # Run isort for import sorting
     print("\n📦 Running isort for import sorting...")
-    isort_commands = [
-        "isort src/ tests/",
-        "isort . --skip-glob='*/.git/*' --skip-glob='*/.venv/*' --skip-glob='*/venv/*'",
-    ]
-    
-    for cmd in isort_commands:
-        run_command(cmd, "Import sorting")
-    
-    # Check the results
-    print("\n🔍 Checking formatting results...")
-    check_commands = [
-        ("black --check --diff src/ tests/", "Black formatting check"),
-        ("isort --check-only --diff src/ tests/", "Import sorting check"),
-    ]
+    isort_ok = run_isort(python_files)
     
-    all_good = True
-    for cmd, desc in check_commands:
-        if not run_command(cmd, desc):
-            all_good = False
+    # Both tools rewrote files in place and reported any failures, so a
+    # separate --check pass would only re-parse everything to learn nothing new
+    all_good = black_ok and isort_ok
     
     # Summary
     print("\n" + "=" * 40)
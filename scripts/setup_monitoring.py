@@ -4,68 +4,108 @@ Setup script for Housing Price Prediction MLOps Monitoring Stack
 """
 
 import os
+import shutil
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import requests
+# requests (and urllib3) are imported lazily inside the HTTP helpers so the
+# early-exit paths, such as Docker not being installed, don't pay for them
 
 
-def run_command(command, description):
-    """Run a shell command and handle errors"""
+def run_command(argv, description):
+    """Run a command given as an argv list (no shell) and report whether it succeeded"""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed successfully")
-        return result.stdout
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed: {e.stderr}")
-        return None
-
-def check_service_health(url, service_name, timeout=30):
-    """Check if a service is healthy"""
+        result = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    except OSError as e:
+        print(f"❌ {description} failed: {e}")
+        return False
+    
+    if result.returncode != 0:
+        # Only decode the captured output when there is an error to report
+        print(f"❌ {description} failed: {result.stderr.decode(errors='replace')}")
+        return False
+    
+    print(f"✅ {description} completed successfully")
+    return True
+
+def create_session(retry=False):
+    """Create a session with a pooled HTTP adapter shared by all probes"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    max_retries = 0
+    if retry:
+        # Retry connection errors and 5xx responses with exponential backoff
+        # (0.2s, 0.4s, 0.8s, ...), giving each service roughly 25s to come up
+        max_retries = Retry(
+            total=7,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=["GET", "HEAD"],
+        )
+    
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_maxsize=16, max_retries=max_retries))
+    return session
+
+def check_service_health(session, url, service_name):
+    """Check if a service is healthy; retries and backoff are handled by the adapter"""
+    import requests
+
     print(f"🔍 Checking {service_name} health at {url}...")
-    start_time = time.time()
-    
-    while time.time() - start_time < timeout:
-        try:
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                print(f"✅ {service_name} is healthy")
-                return True
-        except requests.exceptions.RequestException:
-            pass
-        
-        time.sleep(2)
+    try:
+        # HEAD avoids transferring the response body
+        response = session.head(url, timeout=(2, 2), allow_redirects=True)
+        if response.status_code == 405:
+            # Endpoint only accepts GET; check the status without reading the body
+            response = session.get(url, timeout=(2, 2), stream=True)
+            response.close()
+        if response.status_code == 200:
+            print(f"✅ {service_name} is healthy")
+            return True
+    except requests.exceptions.RequestException:
+        pass
     
-    print(f"❌ {service_name} health check failed after {timeout}s")
+    print(f"❌ {service_name} health check failed")
     return False
 
+def check_services_health(services):
+    """Check a list of (url, service_name) pairs in parallel, one result per service"""
+    with create_session(retry=True) as session:
+        with ThreadPoolExecutor(max_workers=len(services)) as pool:
+            return list(
+                pool.map(lambda service: check_service_health(session, *service), services)
+            )
+
 def setup_monitoring_stack():
     """Set up the complete monitoring stack"""
     print("🚀 Setting up Housing Price Prediction MLOps Monitoring Stack")
     print("=" * 60)
     
-    # Check if Docker is installed
-    if not run_command("docker --version", "Checking Docker installation"):
+    # Check if Docker is installed (a PATH lookup, no need to run the binaries)
+    if not shutil.which("docker"):
         print("❌ Docker is not installed. Please install Docker first.")
         return False
     
-    if not run_command("docker-compose --version", "Checking Docker Compose installation"):
-        print("❌ Docker Compose is not installed. Please install Docker Compose first.")
-        return False
+    # Prefer standalone docker-compose, else the Compose v2 plugin bundled with Docker
+    compose = ["docker-compose"] if shutil.which("docker-compose") else ["docker", "compose"]
+    compose_file = ["-f", "monitoring/docker-compose.monitoring.yml"]
     
     # Create monitoring directory if it doesn't exist
     monitoring_dir = Path("monitoring")
     monitoring_dir.mkdir(exist_ok=True)
     
     # Stop any existing containers
-    run_command("docker-compose -f monitoring/docker-compose.monitoring.yml down", 
+    run_command([*compose, *compose_file, "down"],
                 "Stopping existing monitoring containers")
     
     # Build and start the monitoring stack
-    if not run_command("docker-compose -f monitoring/docker-compose.monitoring.yml up -d --build", 
+    if not run_command([*compose, *compose_file, "up", "-d", "--build"],
                        "Starting monitoring stack"):
         return False
     
@@ -82,10 +122,7 @@ def setup_monitoring_stack():
         ("http://localhost:9093", "Alertmanager")
     ]
     
-    all_healthy = True
-    for url, service in services:
-        if not check_service_health(url, service):
-            all_healthy = False
+    all_healthy = all(check_services_health(services))
     
     if all_healthy:
         print("\n🎉 Monitoring stack setup completed successfully!")
@@ -116,41 +153,19 @@ def print_service_urls():
     print("Restart:       docker-compose -f monitoring/docker-compose.monitoring.yml restart")
     print("Scale API:     docker-compose -f monitoring/docker-compose.monitoring.yml up -d --scale housing-api=3")
 
-def setup_grafana_datasource():
-    """Configure Grafana datasource"""
-    print("🔄 Configuring Grafana datasource...")
-    
-    # Wait for Grafana to be ready
-    if not check_service_health("http://localhost:3001", "Grafana", 60):
-        return False
-    
-    # Configure Prometheus datasource
-    datasource_config = {
-        "name": "Prometheus",
-        "type": "prometheus",
-        "url": "http://prometheus:9090",
-        "access": "proxy",
-        "isDefault": True
-    }
-    
+def _test_endpoint(session, url, name):
+    """Request a single monitoring endpoint and report its status"""
+    import requests
+
     try:
-        response = requests.post(
-            "http://localhost:3001/api/datasources",
-            json=datasource_config,
-            auth=("admin", "admin"),
-            headers={"Content-Type": "application/json"}
-        )
-        
-        if response.status_code in [200, 409]:  # 409 = already exists
-            print("✅ Grafana datasource configured")
-            return True
+        response = session.get(url, timeout=10, stream=True)
+        response.close()
+        if response.status_code == 200:
+            print(f"✅ {name}: OK")
         else:
-            print(f"❌ Failed to configure Grafana datasource: {response.text}")
-            return False
-            
+            print(f"❌ {name}: HTTP {response.status_code}")
     except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to configure Grafana datasource: {e}")
-        return False
+        print(f"❌ {name}: {e}")
 
 def test_monitoring_endpoints():
     """Test monitoring endpoints"""
@@ -164,15 +179,9 @@ def test_monitoring_endpoints():
         ("http://localhost:3000/api/metrics/summary", "Dashboard Metrics")
     ]
     
-    for url, name in endpoints:
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                print(f"✅ {name}: OK")
-            else:
-                print(f"❌ {name}: HTTP {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            print(f"❌ {name}: {e}")
+    with create_session() as session:
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+            list(pool.map(lambda endpoint: _test_endpoint(session, *endpoint), endpoints))
 
 def main():
     """Main setup function"""
@@ -183,11 +192,9 @@ def main():
         os.chdir(project_root)
         
         # Setup monitoring stack
+        # Grafana's Prometheus datasource is provisioned from
+        # monitoring/grafana-provisioning/ when its container starts
         if setup_monitoring_stack():
-            # Configure Grafana
-            time.sleep(5)  # Give Grafana more time to start
-            setup_grafana_datasource()
-            
             # Test endpoints
             test_monitoring_endpoints()
             
@@ -0,0 +1,138 @@
+"""
+Request-coalescing micro-batcher for single-instance predictions
+"""
+
+import asyncio
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Fuses concurrent single-row predictions into one model.predict call.
+
+    Each caller submits a feature row and awaits its result. A background task
+    collects rows for up to ``window_ms`` (or until ``max_batch_size`` rows are
+    pending), stacks them into one matrix and fans the predictions back out.
+    """
+
+    def __init__(
+        self,
+        window_ms: float = 5.0,
+        max_batch_size: int = 64,
+        executor=None,
+    ):
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the batching task on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching task and cancel any requests still waiting"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            future.cancel()
+
+    async def predict(self, model: Any, row: np.ndarray) -> float:
+        """Predict a single feature row, batched with concurrent callers"""
+        loop = asyncio.get_running_loop()
+        if not self.running:
+            # Not started (e.g. app used without lifespan events): predict the
+            # row on its own, still off the event loop
+            prediction = await loop.run_in_executor(
+                self.executor, model.predict, row[np.newaxis, :]
+            )
+            return np.asarray(prediction).item(0)
+
+        future = loop.create_future()
+        self._queue.put_nowait((model, row, future))
+        return await future
+
+    async def _collect(self, items: List[Tuple[Any, np.ndarray, asyncio.Future]]):
+        """Wait for one request, then gather more into items until the window closes"""
+        loop = asyncio.get_running_loop()
+        items.append(await self._queue.get())
+        deadline = loop.time() + self.window_seconds
+
+        while len(items) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                items.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self):
+        """Batching loop: collect, predict once per model, fan results out"""
+        while True:
+            items = []
+            try:
+                await self._collect(items)
+                await self._predict(items)
+            except asyncio.CancelledError:
+                # Requests already taken off the queue are only referenced here;
+                # cancel them so their callers don't wait forever on stop()
+                for _, _, future in items:
+                    if not future.done():
+                        future.cancel()
+                raise
+
+    async def _predict(self, items: List[Tuple[Any, np.ndarray, asyncio.Future]]):
+        """Predict once per model over the collected items and fan results out"""
+        loop = asyncio.get_running_loop()
+
+        # A reload can swap the model mid-window; batch per model instance
+        groups = {}
+        for model, row, future in items:
+            groups.setdefault(id(model), (model, []))[1].append((row, future))
+
+        for model, requests in groups.values():
+            futures = [future for _, future in requests]
+            try:
+                input_data = np.stack([row for row, _ in requests])
+                predictions = np.asarray(
+                    await loop.run_in_executor(self.executor, model.predict, input_data)
+                )
+                if len(predictions) != len(futures):
+                    raise ValueError(
+                        f"Model returned {len(predictions)} predictions "
+                        f"for {len(futures)} rows"
+                    )
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            # tolist() hands every caller a plain Python float
+            for future, prediction in zip(futures, predictions.tolist()):
+                if not future.done():
+                    future.set_result(prediction)
@@ -8,24 +8,43 @@ import os
 import sys
 import time
 import uuid
-from datetime import datetime
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import mlflow
 import mlflow.sklearn
+import msgspec
 import numpy as np
-import pandas as pd
 import uvicorn
 import yaml
 from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, PlainTextResponse
-from pydantic import BaseModel, Field, validator
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# Parse YAML with libyaml's C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from api.batching import MicroBatcher
+from api.models import (
+    FEATURE_NAMES,
+    batch_request_decoder,
+    batch_uuids,
+    features_to_matrix,
+    iso_now,
+)
 from utils.dashboard import run_dashboard
 
 # Import monitoring and logging utilities
@@ -34,6 +53,7 @@ from utils.monitoring import alert_manager, health_checker, metrics_collector
 from utils.prometheus_metrics import (
     get_prometheus_content_type,
     get_prometheus_metrics,
+    record_batch_prediction_metrics,
     record_prediction_metrics,
     record_request_metrics,
     update_health_status,
@@ -43,11 +63,12 @@ from utils.prometheus_metrics import (
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
 def load_config():
-    """Load configuration from config.yaml"""
+    """Load configuration from config.yaml (parsed once per process)"""
     config_path = Path(__file__).parent.parent.parent / "configs" / "config.yaml"
     with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=SafeLoader)
     return config
 
 
@@ -61,6 +82,8 @@ app = FastAPI(
     version=config["api"]["version"],
     docs_url="/docs",
     redoc_url="/redoc",
+    # Encode responses with orjson instead of the stdlib json module
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -71,6 +94,44 @@ app.add_middleware(
     allow_headers=config["api"]["cors"]["allow_headers"],
 )
 
+# Compress larger responses (Prometheus scrapes, batch predictions) for clients
+# that accept gzip; small responses aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+# Request events are handed to a background task so the middleware never waits
+# on logging or metric storage; events beyond the queue bound are dropped
+REQUEST_METRICS_QUEUE_SIZE = 10000
+REQUEST_METRICS_BATCH_SIZE = 100
+
+
+def record_request_events(events):
+    """Log and record a batch of (method, endpoint, status_code, duration) events"""
+    for method, endpoint, status_code, duration in events:
+        log_api_request(method=method, endpoint=endpoint)
+        record_request_metrics(method, endpoint, status_code, duration)
+
+    metrics_collector.record_api_requests(
+        [
+            (endpoint, method, status_code, duration * 1000)
+            for method, endpoint, status_code, duration in events
+        ]
+    )
+
+
+async def drain_request_events(queue: asyncio.Queue):
+    """Record queued request events in batches, off the event loop"""
+    loop = asyncio.get_running_loop()
+    while True:
+        events = [await queue.get()]
+        while len(events) < REQUEST_METRICS_BATCH_SIZE and not queue.empty():
+            events.append(queue.get_nowait())
+
+        try:
+            await loop.run_in_executor(None, record_request_events, events)
+        except Exception as e:
+            logger.error(f"Failed to record request metrics: {e}")
+
 
 # Add monitoring middleware
 @app.middleware("http")
@@ -84,85 +145,153 @@ async def monitoring_middleware(request: Request, call_next):
     # Calculate duration
     duration = time.time() - start_time
 
-    # Extract request info
-    method = request.method
-    endpoint = str(request.url.path)
-    status_code = response.status_code
-
-    # Log API request
-    log_api_request(method=method, endpoint=endpoint)
+    event = (request.method, str(request.url.path), response.status_code, duration)
 
-    # Record metrics
-    metrics_collector.record_api_request(method, endpoint, status_code, duration)
-    record_request_metrics(method, endpoint, status_code, duration)
+    queue = getattr(app.state, "request_metrics_queue", None)
+    if queue is None:
+        # Startup hasn't run (e.g. app used without lifespan events): record inline
+        record_request_events([event])
+    else:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            app.state.request_metrics_dropped += 1
 
     return response
 
 
-# Global variables for model and scaler
-model = None
-model_version = None
+# Registered model name; the loaded model itself lives on app.state.bundle
 model_name = config["mlflow"]["model_registry"]["registered_model_name"]
 
+# Reads every feature of an instance, in FEATURE_NAMES order, as one tuple
+get_features = attrgetter(*FEATURE_NAMES)
+
+# Upper bound on /predict/batch bodies, checked from Content-Length before the
+# instances are validated
+MAX_BATCH_REQUEST_BYTES = config["api"].get("max_batch_request_bytes", 64 * 1024)
+
+# Inference runs in a small thread pool so model.predict never blocks the event
+# loop; BLAS threads are pinned to 1 in the Docker image to avoid oversubscription
+INFERENCE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Models are fitted on DataFrames but fed plain arrays in FEATURE_NAMES order,
+# so sklearn's missing-feature-names warning carries no information here
+warnings.filterwarnings(
+    "ignore", message="X does not have valid feature names", category=UserWarning
+)
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """A loaded model with its metadata, swapped in as a single object on reload"""
+
+    model: Any
+    version: str
+    input_dtype: Any = np.float64
+    feature_names: Tuple[str, ...] = FEATURE_NAMES
+
+    @classmethod
+    def from_model(cls, loaded_model, version: str) -> "ModelBundle":
+        """Prepare a freshly loaded model for inference and bundle it"""
+        return cls(
+            model=loaded_model,
+            version=version,
+            input_dtype=prepare_for_inference(loaded_model),
+        )
+
+
+# Handlers read app.state.bundle once per request, so a reload can never pair a
+# new model with an old version
+app.state.bundle = None
+
+
+def prepare_for_inference(loaded_model):
+    """Cast linear weights to float32 and return the input dtype to feed the model"""
+    estimator = (
+        loaded_model.steps[-1][1] if hasattr(loaded_model, "steps") else loaded_model
+    )
+
+    if hasattr(estimator, "tree_") or hasattr(estimator, "estimators_"):
+        # sklearn trees convert inputs to float32 before traversal, so passing
+        # float32 skips that copy; thresholds live in the compiled Tree nodes
+        return np.float32
+
+    if hasattr(estimator, "coef_"):
+        estimator.coef_ = np.asarray(estimator.coef_, dtype=np.float32)
+        estimator.intercept_ = np.asarray(estimator.intercept_, dtype=np.float32)
+        return np.float32
+
+    return np.float64
+
+
+async def run_inference(model, input_data: np.ndarray):
+    """Run model.predict on the inference pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    # Falls back to the loop's default executor if startup hasn't run
+    pool = getattr(app.state, "infer_pool", None)
+    return await loop.run_in_executor(pool, model.predict, input_data)
+
 
 class HousingFeatures(BaseModel):
     """Input schema for housing price prediction"""
 
     MedInc: float = Field(
-        ..., description="Median income in block group", ge=0.0, le=20.0, example=8.3252
+        ...,
+        description="Median income in block group",
+        ge=0.0,
+        le=20.0,
+        examples=[8.3252],
     )
     HouseAge: float = Field(
         ...,
         description="Median house age in block group",
         ge=0.0,
         le=100.0,
-        example=41.0,
+        examples=[41.0],
     )
     AveRooms: float = Field(
         ...,
         description="Average number of rooms per household",
         ge=1.0,
         le=50.0,
-        example=6.984127,
+        examples=[6.984127],
     )
     AveBedrms: float = Field(
         ...,
         description="Average number of bedrooms per household",
         ge=0.0,
         le=10.0,
-        example=1.023810,
+        examples=[1.023810],
     )
     Population: float = Field(
-        ..., description="Block group population", ge=1.0, le=50000.0, example=322.0
+        ..., description="Block group population", ge=1.0, le=50000.0, examples=[322.0]
     )
     AveOccup: float = Field(
         ...,
         description="Average number of household members",
         ge=1.0,
         le=20.0,
-        example=2.555556,
+        examples=[2.555556],
     )
     Latitude: float = Field(
-        ..., description="Block group latitude", ge=32.0, le=42.0, example=37.88
+        ..., description="Block group latitude", ge=32.0, le=42.0, examples=[37.88]
     )
     Longitude: float = Field(
-        ..., description="Block group longitude", ge=-125.0, le=-114.0, example=-122.23
+        ...,
+        description="Block group longitude",
+        ge=-125.0,
+        le=-114.0,
+        examples=[-122.23],
     )
 
-    @validator("*", pre=True)
-    def validate_numeric(cls, v):
-        """Ensure all values are numeric"""
-        if v is None:
-            raise ValueError("Value cannot be None")
-        try:
-            return float(v)
-        except (ValueError, TypeError):
-            raise ValueError("Value must be numeric")
-
 
 class PredictionResponse(BaseModel):
     """Response schema for housing price prediction"""
 
+    # model_version / model_loaded are API fields, not pydantic internals;
+    # responses are built once by the server and never modified
+    model_config = ConfigDict(protected_namespaces=(), extra="forbid", frozen=True)
+
     prediction: float = Field(
         ..., description="Predicted house value in hundreds of thousands of dollars"
     )
@@ -180,6 +309,10 @@ class PredictionResponse(BaseModel):
 class HealthResponse(BaseModel):
     """Response schema for health check"""
 
+    # model_version / model_loaded are API fields, not pydantic internals;
+    # responses are built once by the server and never modified
+    model_config = ConfigDict(protected_namespaces=(), extra="forbid", frozen=True)
+
     status: str = Field(..., description="Service status")
     model_loaded: bool = Field(..., description="Whether model is loaded")
     model_version: Optional[str] = Field(None, description="Loaded model version")
@@ -191,10 +324,17 @@ class BatchPredictionRequest(BaseModel):
     """Request schema for batch predictions"""
 
     instances: List[HousingFeatures] = Field(
-        ..., description="List of housing features for batch prediction"
+        ...,
+        description="List of housing features for batch prediction",
+        min_length=1,
+        max_length=100,
+    )
+    batch_name: Optional[str] = Field(
+        None, description="Optional name for the batch", max_length=100
     )
 
-    @validator("instances")
+    @field_validator("instances")
+    @classmethod
     def validate_batch_size(cls, v):
         if len(v) == 0:
             raise ValueError("At least one instance is required")
@@ -203,9 +343,27 @@ class BatchPredictionRequest(BaseModel):
         return v
 
 
+# Request body schema for /predict/batch, which reads the raw body itself and
+# decodes it with api.models.batch_request_decoder; BatchPredictionRequest
+# describes exactly what that decoder and validate_feature_matrix() enforce.
+# HousingFeatures is already registered in the OpenAPI components by /predict
+BATCH_REQUEST_SCHEMA = BatchPredictionRequest.model_json_schema(
+    ref_template="#/components/schemas/{model}"
+)
+BATCH_REQUEST_SCHEMA.pop("$defs", None)
+BATCH_REQUEST_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": BATCH_REQUEST_SCHEMA}},
+    }
+}
+
+
 class BatchPredictionResponse(BaseModel):
     """Response schema for batch predictions"""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     predictions: List[PredictionResponse] = Field(
         ..., description="List of predictions"
     )
@@ -218,29 +376,52 @@ class BatchPredictionResponse(BaseModel):
 startup_time = time.time()
 
 
-async def load_model():
+async def warm_up_model(bundle: ModelBundle):
+    """Run throwaway predictions so the first real request doesn't pay for lazy setup"""
+    n_features = len(bundle.feature_names)
+    # Single-row and batch shapes, both on the inference pool
+    for batch_size in (1, 64):
+        start_time = time.time()
+        try:
+            await run_inference(
+                bundle.model,
+                np.zeros((batch_size, n_features), dtype=bundle.input_dtype),
+            )
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {e}")
+            return
+        logger.info(
+            "Model warm-up with %d row(s) took %.4fs",
+            batch_size,
+            time.time() - start_time,
+        )
+
+
+async def load_model() -> Optional[ModelBundle]:
     """Load the latest model from MLflow Model Registry"""
-    global model, model_version
 
     # Direct model loading from available artifacts (works even without MLflow server)
     try:
         from pathlib import Path
         
-        # Find available model artifacts
+        # Find the first available model artifact (stop scanning at the first match)
         models_dir = Path("./mlruns/1/models/")
         if models_dir.exists():
-            model_paths = list(models_dir.glob("m-*"))
-            if model_paths:
+            model_path = None
+            with os.scandir(models_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith("m-") and entry.is_dir():
+                        model_path = Path(entry.path)
+                        break
+            if model_path is not None:
                 # Load the first available model (you could implement logic to choose the best one)
-                model_path = model_paths[0]
                 model_artifact_path = model_path / "artifacts"
                 
-                model = mlflow.sklearn.load_model(str(model_artifact_path))
-                model_version = model_path.name
+                loaded_model = mlflow.sklearn.load_model(str(model_artifact_path))
                 
                 logger.info(f"Successfully loaded model from {model_artifact_path}")
-                logger.info(f"Model type: {type(model).__name__}")
-                return True
+                logger.info(f"Model type: {type(loaded_model).__name__}")
+                return ModelBundle.from_model(loaded_model, model_path.name)
         
         logger.warning("No model artifacts found in ./mlruns/1/models/")
     except Exception as direct_error:
@@ -256,10 +437,9 @@ async def load_model():
             if not runs.empty:
                 latest_run = runs.iloc[0]
                 model_uri = f"runs:/{latest_run.run_id}/model"
-                model = mlflow.sklearn.load_model(model_uri)
-                model_version = "latest"
+                loaded_model = mlflow.sklearn.load_model(model_uri)
                 logger.info("Loaded model from latest MLflow run")
-                return True
+                return ModelBundle.from_model(loaded_model, "latest")
         else:
             logger.warning(
                 "No 'housing-price-prediction' experiment found in local MLflow"
@@ -284,23 +464,23 @@ async def load_model():
 
         if not latest_versions:
             logger.error(f"No versions found for model {model_name}")
-            return False
+            return None
 
         # Use the first available version (could be enhanced to prefer Production > Staging > None)
         model_version_info = latest_versions[0]
-        model_version = model_version_info.version
+        version = model_version_info.version
 
         # Load the model
-        model_uri = f"models:/{model_name}/{model_version}"
-        model = mlflow.sklearn.load_model(model_uri)
+        model_uri = f"models:/{model_name}/{version}"
+        loaded_model = mlflow.sklearn.load_model(model_uri)
 
-        logger.info(f"Successfully loaded model {model_name} version {model_version}")
-        return True
+        logger.info(f"Successfully loaded model {model_name} version {version}")
+        return ModelBundle.from_model(loaded_model, version)
 
     except Exception as e:
         logger.error(f"MLflow server model loading failed: {e}")
 
-        return False
+        return None
 
 
 @app.on_event("startup")
@@ -308,17 +488,41 @@ async def startup_event():
     """Initialize the application"""
     logger.info("Starting Housing Price Prediction API...")
 
+    # Thread pool for model inference
+    app.state.infer_pool = ThreadPoolExecutor(
+        max_workers=INFERENCE_WORKERS, thread_name_prefix="infer"
+    )
+
+    # Coalesce concurrent single predictions into batched model.predict calls
+    batching_config = config["api"].get("batching", {})
+    if batching_config.get("enabled", False):
+        app.state.batcher = MicroBatcher(
+            window_ms=batching_config.get("window_ms", 5),
+            max_batch_size=batching_config.get("max_batch_size", 64),
+            executor=app.state.infer_pool,
+        )
+        app.state.batcher.start()
+
+    # Start recording request metrics in the background
+    app.state.request_metrics_queue = asyncio.Queue(maxsize=REQUEST_METRICS_QUEUE_SIZE)
+    app.state.request_metrics_dropped = 0
+    app.state.request_metrics_task = asyncio.create_task(
+        drain_request_events(app.state.request_metrics_queue)
+    )
+
     # Initialize monitoring (metrics collector is already initialized)
     logger.info("Metrics collector initialized and ready")
 
     # Try to load the model (non-blocking)
     try:
-        model_loaded = await load_model()
-        if not model_loaded:
+        bundle = await load_model()
+        if bundle is None:
             logger.warning(
                 "Failed to load model. API will start but predictions will fail."
             )
         else:
+            await warm_up_model(bundle)
+            app.state.bundle = bundle
             logger.info("Model loaded successfully")
     except Exception as e:
         logger.error(f"Error during model loading: {e}")
@@ -332,6 +536,20 @@ async def shutdown_event():
     """Cleanup on application shutdown"""
     logger.info("Shutting down Housing Price Prediction API...")
 
+    # Stop batching, then stop accepting inference work
+    batcher = getattr(app.state, "batcher", None)
+    if batcher is not None:
+        await batcher.stop()
+    app.state.infer_pool.shutdown(wait=False)
+
+    # Stop the request metrics drain task
+    app.state.request_metrics_task.cancel()
+    if app.state.request_metrics_dropped:
+        logger.warning(
+            f"Dropped {app.state.request_metrics_dropped} request metric events "
+            "(queue full)"
+        )
+
     # Stop background monitoring
     metrics_collector.stop_background_collection()
 
@@ -349,71 +567,106 @@ async def root():
     }
 
 
-@app.get("/health", response_model=HealthResponse)
+# /health is polled by load balancers; the serialized body is reused for up to
+# this many seconds, and rebuilt at once if the loaded model changes
+HEALTH_CACHE_SECONDS = 1.0
+_health_cache: Tuple[float, Optional[ModelBundle], bytes] = (float("-inf"), None, b"")
+
+
+@app.get("/health", response_model=HealthResponse, response_model_exclude_none=True)
 async def health_check():
     """Health check endpoint"""
-    current_time = time.time()
-    uptime = current_time - startup_time
-
-    return HealthResponse(
-        status="healthy" if model is not None else "unhealthy",
-        model_loaded=model is not None,
-        model_version=model_version,
-        timestamp=datetime.utcnow().isoformat() + "Z",
-        uptime_seconds=uptime,
-    )
+    global _health_cache
+
+    now = time.monotonic()
+    bundle = app.state.bundle
+    cached_at, cached_bundle, body = _health_cache
+
+    if now - cached_at >= HEALTH_CACHE_SECONDS or cached_bundle is not bundle:
+        # Server-built, so validation is skipped
+        response = HealthResponse.model_construct(
+            status="healthy" if bundle is not None else "unhealthy",
+            model_loaded=bundle is not None,
+            model_version=bundle.version if bundle is not None else None,
+            timestamp=iso_now(),
+            uptime_seconds=time.time() - startup_time,
+        )
+        body = response.model_dump_json(exclude_none=True).encode()
+        _health_cache = (now, bundle, body)
+
+    return Response(content=body, media_type="application/json")
 
 
 @app.post("/predict", response_model=PredictionResponse)
 async def predict_house_price(features: HousingFeatures):
     """Predict house price for a single instance"""
 
-    if model is None:
+    bundle = app.state.bundle
+    if bundle is None:
         raise HTTPException(
             status_code=503,
             detail="Model not loaded. Please check the health endpoint.",
         )
 
     try:
-        # Convert input to DataFrame
-        input_data = pd.DataFrame([features.dict()])
+        feat_dict = features.model_dump()
+
+        # Build the input row directly as an array, skipping DataFrame construction
+        input_row = np.array(get_features(features), dtype=bundle.input_dtype)
 
-        # Make prediction
+        # Make prediction (batched with concurrent requests when enabled). With
+        # batching on, prediction_time is the caller's end-to-end latency and
+        # includes up to window_ms of queueing, not just model.predict
         start_time = time.time()
-        prediction = model.predict(input_data)[0]
+        batcher = getattr(app.state, "batcher", None)
+        if batcher is not None:
+            prediction = await batcher.predict(bundle.model, input_row)
+        else:
+            predictions = await run_inference(bundle.model, input_row[np.newaxis, :])
+            # Converted to a Python float once and reused below
+            prediction = np.asarray(predictions).item(0)
         prediction_time = time.time() - start_time
 
         # Generate unique prediction ID
-        prediction_id = str(uuid.uuid4())
+        prediction_id = uuid.uuid4().hex
 
         # Log prediction to database and structured logs
         db_logger.log_prediction(
             prediction_id=prediction_id,
-            model_version=model_version or "unknown",
-            input_features=features.dict(),
-            prediction=float(prediction),
+            model_version=bundle.version,
+            input_features=feat_dict,
+            prediction=prediction,
             processing_time_ms=prediction_time * 1000,
         )
 
         # Record metrics
         metrics_collector.record_model_prediction(
             model_name=model_name,
-            model_version=model_version or "unknown",
+            model_version=bundle.version,
             prediction_time_ms=prediction_time * 1000,
-            prediction_value=float(prediction),
-        )
-        record_prediction_metrics(model_name, float(prediction), prediction_time)
-
-        logger.info(
-            f"Prediction {prediction_id}: {prediction:.4f} (took {prediction_time:.4f}s)"
+            prediction_value=prediction,
         )
+        record_prediction_metrics(model_name, prediction, prediction_time)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Prediction %s: %.4f (took %.4fs)",
+                prediction_id,
+                prediction,
+                prediction_time,
+            )
 
-        return PredictionResponse(
-            prediction=float(prediction),
+        # Every field is server-built from validated input, so the response is
+        # neither validated on construction nor again through response_model
+        response = PredictionResponse.model_construct(
+            prediction=prediction,
             prediction_id=prediction_id,
-            model_version=model_version or "unknown",
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            input_features=features.dict(),
+            model_version=bundle.version,
+            timestamp=iso_now(),
+            input_features=feat_dict,
+        )
+        return Response(
+            content=response.model_dump_json(), media_type="application/json"
         )
 
     except Exception as e:
@@ -421,11 +674,40 @@ async def predict_house_price(features: HousingFeatures):
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
-@app.post("/predict/batch", response_model=BatchPredictionResponse)
-async def predict_batch(request: BatchPredictionRequest):
+async def limit_batch_request_size(request: Request):
+    """Reject oversized batch requests before their instances are validated"""
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_BATCH_REQUEST_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Request body too large (limit {MAX_BATCH_REQUEST_BYTES} bytes)",
+        )
+
+
+# Responses are built as plain dicts (server-generated, no need to re-validate);
+# the schema is still documented through BatchPredictionResponse
+@app.post(
+    "/predict/batch",
+    response_model=None,
+    responses={200: {"model": BatchPredictionResponse}},
+    dependencies=[Depends(limit_batch_request_size)],
+    openapi_extra=BATCH_REQUEST_OPENAPI,
+)
+async def predict_batch(raw_request: Request):
     """Predict house prices for multiple instances"""
 
-    if model is None:
+    # The body is decoded by msgspec and its values validated as one matrix
+    # rather than per field by pydantic; BatchPredictionRequest only documents
+    # the schema
+    try:
+        request = batch_request_decoder.decode(await raw_request.body())
+        input_data = features_to_matrix(request.instances)
+        request.validate_bounds_vectorized(input_data)
+    except (msgspec.DecodeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    bundle = app.state.bundle
+    if bundle is None:
         raise HTTPException(
             status_code=503,
             detail="Model not loaded. Please check the health endpoint.",
@@ -433,63 +715,74 @@ async def predict_batch(request: BatchPredictionRequest):
 
     try:
         start_time = time.time()
-        batch_id = str(uuid.uuid4())
-        predictions = []
-
-        # Convert all instances to DataFrame
-        input_data = pd.DataFrame([instance.dict() for instance in request.instances])
-
-        # Make batch prediction
-        batch_predictions = model.predict(input_data)
-
-        # Create individual prediction responses and log each
-        for i, (instance, prediction) in enumerate(
-            zip(request.instances, batch_predictions)
-        ):
-            prediction_id = f"{batch_id}_{i}"
-
-            # Log individual prediction
-            db_logger.log_prediction(
-                prediction_id=prediction_id,
-                model_version=model_version or "unknown",
-                input_features=instance.dict(),
-                prediction=float(prediction),
-                processing_time_ms=0,  # Individual time not tracked in batch
-            )
+        batch_id = uuid.uuid4().hex
 
-            # Record metrics for each prediction
-            record_prediction_metrics(model_name, float(prediction), 0)
-
-            predictions.append(
-                PredictionResponse(
-                    prediction=float(prediction),
-                    prediction_id=prediction_id,
-                    model_version=model_version or "unknown",
-                    timestamp=datetime.utcnow().isoformat() + "Z",
-                    input_features=instance.dict(),
-                )
+        # Make batch prediction; the float64 matrix is kept for logging and
+        # the response, the model gets its own input dtype
+        inference_start = time.time()
+        batch_predictions = await run_inference(
+            bundle.model, input_data.astype(bundle.input_dtype, copy=False)
+        )
+        inference_time = time.time() - inference_start
+
+        version = bundle.version
+        # One C-level conversion of the whole batch to Python floats
+        prediction_values = np.asarray(batch_predictions).tolist()
+        prediction_ids = batch_uuids(len(prediction_values))
+        feature_rows = input_data.tolist()
+
+        # Log and record the whole batch at once (one transaction per sink)
+        db_logger.log_predictions_bulk(
+            prediction_ids=prediction_ids,
+            model_version=version,
+            feature_names=FEATURE_NAMES,
+            feature_rows=feature_rows,
+            predictions=prediction_values,
+            processing_time_ms=0,  # Individual time not tracked in batch
+        )
+        record_batch_prediction_metrics(model_name, prediction_values, inference_time)
+        metrics_collector.record_model_predictions(
+            model_name=model_name,
+            model_version=version,
+            prediction_values=prediction_values,
+            prediction_time_ms=0,  # Individual time not tracked in batch
+        )
+
+        # Build the responses once all side effects are done; every prediction
+        # in the batch came from the same predict call, so they share a timestamp
+        timestamp = iso_now()
+        predictions = [
+            {
+                "prediction": prediction,
+                "prediction_id": prediction_id,
+                "model_version": version,
+                "timestamp": timestamp,
+                "confidence_interval": None,
+                "input_features": dict(zip(FEATURE_NAMES, row)),
+            }
+            for row, prediction, prediction_id in zip(
+                feature_rows, prediction_values, prediction_ids
             )
+        ]
 
         processing_time = time.time() - start_time
 
-        # Record batch metrics
-        for prediction_resp in predictions:
-            metrics_collector.record_model_prediction(
-                model_name=model_name,
-                model_version=model_version or "unknown",
-                prediction_time_ms=0,  # Individual time not tracked in batch
-                prediction_value=prediction_resp.prediction,
+        # One summary line per batch rather than one per prediction
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Batch prediction %s: %d instances processed in %.4fs",
+                batch_id,
+                len(predictions),
+                processing_time,
             )
 
-        logger.info(
-            f"Batch prediction {batch_id}: {len(predictions)} instances processed in {processing_time:.4f}s"
-        )
-
-        return BatchPredictionResponse(
-            predictions=predictions,
-            batch_id=batch_id,
-            total_instances=len(predictions),
-            processing_time_seconds=processing_time,
+        return ORJSONResponse(
+            {
+                "predictions": predictions,
+                "batch_id": batch_id,
+                "total_instances": len(predictions),
+                "processing_time_seconds": processing_time,
+            }
         )
 
     except Exception as e:
@@ -503,39 +796,27 @@ async def predict_batch(request: BatchPredictionRequest):
 async def get_model_info():
     """Get information about the loaded model"""
 
-    if model is None:
+    bundle = app.state.bundle
+    if bundle is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
 
+    model = bundle.model
+
     try:
         # Get model metadata
         model_info = {
             "model_name": model_name,
-            "model_version": model_version,
+            "model_version": bundle.version,
             "model_type": type(model).__name__,
-            "loaded_at": datetime.utcnow().isoformat() + "Z",
+            "loaded_at": iso_now(),
         }
 
         # Add model-specific information if available
         if hasattr(model, "feature_importances_"):
-            # For tree-based models
-            feature_names = [
-                "MedInc",
-                "HouseAge",
-                "AveRooms",
-                "AveBedrms",
-                "Population",
-                "AveOccup",
-                "Latitude",
-                "Longitude",
-            ]
-            importances = model.feature_importances_
-            # Handle both numpy arrays and lists
-            if hasattr(importances, "tolist"):
-                importances_list = importances.tolist()
-            else:
-                importances_list = list(importances)
+            # For tree-based models; importances follow the FEATURE_NAMES order
+            importances = np.asarray(model.feature_importances_).tolist()
             model_info["feature_importances"] = dict(
-                zip(feature_names, importances_list)
+                zip(bundle.feature_names, importances)
             )
 
         if hasattr(model, "n_estimators"):
@@ -558,13 +839,16 @@ async def reload_model():
     """Reload the model from MLflow Model Registry"""
 
     try:
-        success = await load_model()
+        bundle = await load_model()
 
-        if success:
+        if bundle is not None:
+            # Warm up the new model, then swap the whole bundle in one assignment
+            await warm_up_model(bundle)
+            app.state.bundle = bundle
             return {
                 "message": "Model reloaded successfully",
-                "model_version": model_version,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "model_version": bundle.version,
+                "timestamp": iso_now(),
             }
         else:
             raise HTTPException(status_code=500, detail="Failed to reload model")
@@ -580,9 +864,11 @@ async def reload_model():
 @app.get("/metrics")
 async def prometheus_metrics():
     """Prometheus metrics endpoint"""
+    # generate_latest() already returns bytes; pass them through as-is. The
+    # content type is set verbatim since it already carries a charset
     metrics_data = get_prometheus_metrics()
-    return PlainTextResponse(
-        content=metrics_data, media_type=get_prometheus_content_type()
+    return Response(
+        content=metrics_data, headers={"Content-Type": get_prometheus_content_type()}
     )
 
 
@@ -640,7 +926,7 @@ async def test_alert():
 # Error handlers
 @app.exception_handler(ValueError)
 async def value_error_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400, content={"detail": f"Invalid input: {str(exc)}"}
     )
 
@@ -648,7 +934,7 @@ async def value_error_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(status_code=500, content={"detail": "Internal server error"})
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
 
 
 def main():
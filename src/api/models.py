@@ -2,11 +2,54 @@
 Pydantic models for API request/response schemas
 """
 
+import os
+import time
 import uuid
-from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, validator
+import msgspec
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    field_validator,
+    model_validator,
+)
+from typing_extensions import Annotated
+
+# Column order the model was trained with; prediction inputs are built in this order
+FEATURE_NAMES = (
+    "MedInc",
+    "HouseAge",
+    "AveRooms",
+    "AveBedrms",
+    "Population",
+    "AveOccup",
+    "Latitude",
+    "Longitude",
+)
+
+# Reads every feature of an instance, in FEATURE_NAMES order, as one tuple
+_get_features = attrgetter(*FEATURE_NAMES)
+
+
+def features_to_matrix(instances, dtype=np.float64) -> np.ndarray:
+    """
+    Stack feature instances into an (n, 8) array in FEATURE_NAMES order
+
+    Works for HousingFeatures and HousingFeaturesFast alike. Values are
+    streamed into one flat buffer, with no per-instance dict or DataFrame.
+    """
+    n_instances = len(instances)
+    return np.fromiter(
+        chain.from_iterable(map(_get_features, instances)),
+        dtype=dtype,
+        count=n_instances * len(FEATURE_NAMES),
+    ).reshape(n_instances, len(FEATURE_NAMES))
 
 
 class HousingFeatures(BaseModel):
@@ -17,84 +60,68 @@ class HousingFeatures(BaseModel):
         description="Median income in block group (in tens of thousands of dollars)",
         ge=0.0,
         le=20.0,
-        example=8.3252,
+        examples=[8.3252],
     )
     HouseAge: float = Field(
         ...,
         description="Median house age in block group (years)",
         ge=0.0,
         le=100.0,
-        example=41.0,
+        examples=[41.0],
     )
     AveRooms: float = Field(
         ...,
         description="Average number of rooms per household",
         ge=1.0,
         le=50.0,
-        example=6.984127,
+        examples=[6.984127],
     )
     AveBedrms: float = Field(
         ...,
         description="Average number of bedrooms per household",
         ge=0.0,
         le=10.0,
-        example=1.023810,
+        examples=[1.023810],
     )
     Population: float = Field(
-        ..., description="Block group population", ge=1.0, le=50000.0, example=322.0
+        ..., description="Block group population", ge=1.0, le=50000.0, examples=[322.0]
     )
     AveOccup: float = Field(
         ...,
         description="Average number of household members",
         ge=1.0,
         le=20.0,
-        example=2.555556,
+        examples=[2.555556],
     )
     Latitude: float = Field(
         ...,
         description="Block group latitude (degrees)",
         ge=32.0,
         le=42.0,
-        example=37.88,
+        examples=[37.88],
     )
     Longitude: float = Field(
         ...,
         description="Block group longitude (degrees)",
         ge=-125.0,
         le=-114.0,
-        example=-122.23,
-    )
-
-    @validator("*", pre=True)
-    def validate_numeric(cls, v):
-        """Ensure all values are numeric and not None"""
-        if v is None:
-            raise ValueError("Value cannot be None")
-        try:
-            return float(v)
-        except (ValueError, TypeError):
-            raise ValueError("Value must be numeric")
-
-    @validator("AveRooms")
-    def validate_rooms_reasonable(cls, v, values):
-        """Validate that average rooms is reasonable"""
-        if "AveBedrms" in values and values["AveBedrms"] is not None:
-            if v < values["AveBedrms"]:
-                raise ValueError("Average rooms cannot be less than average bedrooms")
-        return v
-
-    @validator("AveOccup")
-    def validate_occupancy_reasonable(cls, v, values):
-        """Validate that occupancy is reasonable"""
-        if "Population" in values and "AveRooms" in values:
-            if values["Population"] is not None and values["AveRooms"] is not None:
-                # Basic sanity check
-                if v > values["Population"]:
-                    raise ValueError("Average occupancy cannot exceed total population")
-        return v
+        examples=[-122.23],
+    )
 
-    class Config:
-        schema_extra = {
+    @model_validator(mode="after")
+    def validate_reasonable(self):
+        """Cross-field sanity checks on rooms and occupancy"""
+        if self.AveRooms < self.AveBedrms:
+            raise ValueError("Average rooms cannot be less than average bedrooms")
+        if self.AveOccup > self.Population:
+            raise ValueError("Average occupancy cannot exceed total population")
+        return self
+
+    model_config = ConfigDict(
+        extra="forbid",
+        validate_assignment=False,
+        str_strip_whitespace=False,
+        json_schema_extra={
             "example": {
                 "MedInc": 8.3252,
                 "HouseAge": 41.0,
@@ -105,7 +132,8 @@ class HousingFeatures(BaseModel):
                 "Latitude": 37.88,
                 "Longitude": -122.23,
             }
-        }
+        },
+    )
 
 
 class PredictionResponse(BaseModel):
@@ -129,8 +157,11 @@ class PredictionResponse(BaseModel):
         None, description="Time taken to process prediction in milliseconds"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra="forbid",
+        frozen=True,
+        protected_namespaces=(),
+        json_schema_extra={
             "example": {
                 "prediction": 4.526,
                 "prediction_id": "550e8400-e29b-41d4-a716-446655440000",
@@ -149,7 +180,8 @@ class PredictionResponse(BaseModel):
                 },
                 "processing_time_ms": 15.2,
             }
-        }
+        },
+    )
 
 
 class BatchPredictionRequest(BaseModel):
@@ -158,14 +190,15 @@ class BatchPredictionRequest(BaseModel):
     instances: List[HousingFeatures] = Field(
         ...,
         description="List of housing features for batch prediction",
-        min_items=1,
-        max_items=100,
+        min_length=1,
+        max_length=100,
     )
     batch_name: Optional[str] = Field(
         None, description="Optional name for the batch", max_length=100
     )
 
-    @validator("instances")
+    @field_validator("instances")
+    @classmethod
     def validate_batch_size(cls, v):
         """Validate batch size constraints"""
         if len(v) == 0:
@@ -174,8 +207,8 @@ class BatchPredictionRequest(BaseModel):
             raise ValueError("Maximum batch size is 100 instances")
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "instances": [
                     {
@@ -202,6 +235,70 @@ class BatchPredictionRequest(BaseModel):
                 "batch_name": "test_batch_1",
             }
         }
+    )
+
+
+# Inclusive per-feature bounds in FEATURE_NAMES order, mirroring the Field
+# constraints on HousingFeatures
+FEATURE_LOW = np.array([0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 32.0, -125.0])
+FEATURE_HIGH = np.array([20.0, 100.0, 50.0, 10.0, 50000.0, 20.0, 42.0, -114.0])
+
+
+def validate_feature_matrix(matrix: np.ndarray):
+    """
+    Apply the per-field value bounds to a whole (n, 8) feature matrix
+
+    These are the only value checks /predict makes, so a batch accepts every
+    row /predict accepts. One vectorised comparison replaces n * 8 per-field
+    checks. Raises ValueError naming the first offending instance and feature.
+    """
+    # Written as "not within" so that NaN fails the check too
+    out_of_bounds = ~((matrix >= FEATURE_LOW) & (matrix <= FEATURE_HIGH))
+    if out_of_bounds.any():
+        row, column = np.argwhere(out_of_bounds)[0]
+        raise ValueError(
+            f"instances[{row}].{FEATURE_NAMES[column]}: {matrix[row, column]} "
+            f"is outside [{FEATURE_LOW[column]}, {FEATURE_HIGH[column]}]"
+        )
+
+
+class HousingFeaturesFast(msgspec.Struct):
+    """
+    Batch instance schema, matching the input schema /predict enforces.
+
+    JSON is decoded straight into these structs in C, without building an
+    intermediate dict per instance. Decoding only checks types and, like
+    /predict, ignores unknown fields. The value bounds are applied to the
+    whole batch at once by validate_feature_matrix(). The cross-field checks
+    of HousingFeatures are not applied, since /predict does not apply them.
+    """
+
+    MedInc: float
+    HouseAge: float
+    AveRooms: float
+    AveBedrms: float
+    Population: float
+    AveOccup: float
+    Latitude: float
+    Longitude: float
+
+
+class BatchPredictionRequestFast(msgspec.Struct):
+    """Batch request schema of /predict/batch (see HousingFeaturesFast)"""
+
+    instances: Annotated[
+        List[HousingFeaturesFast], msgspec.Meta(min_length=1, max_length=100)
+    ]
+    batch_name: Optional[Annotated[str, msgspec.Meta(max_length=100)]] = None
+
+    @staticmethod
+    def validate_bounds_vectorized(matrix: np.ndarray):
+        """Validate a features_to_matrix() result; see validate_feature_matrix()"""
+        validate_feature_matrix(matrix)
+
+
+# Reusable decoder; strict=False keeps accepting numeric strings like pydantic
+batch_request_decoder = msgspec.json.Decoder(BatchPredictionRequestFast, strict=False)
 
 
 class BatchPredictionResponse(BaseModel):
@@ -222,6 +319,8 @@ class BatchPredictionResponse(BaseModel):
     )
     timestamp: str = Field(..., description="ISO timestamp when batch was processed")
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
 
 class HealthResponse(BaseModel):
     """Response schema for health check"""
@@ -243,8 +342,11 @@ class HealthResponse(BaseModel):
         None, description="Current CPU usage percentage"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra="forbid",
+        frozen=True,
+        protected_namespaces=(),
+        json_schema_extra={
             "example": {
                 "status": "healthy",
                 "model_loaded": True,
@@ -255,7 +357,8 @@ class HealthResponse(BaseModel):
                 "memory_usage_mb": 256.7,
                 "cpu_usage_percent": 15.3,
             }
-        }
+        },
+    )
 
 
 class ModelInfo(BaseModel):
@@ -277,8 +380,11 @@ class ModelInfo(BaseModel):
         None, description="Training performance metrics"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra="forbid",
+        frozen=True,
+        protected_namespaces=(),
+        json_schema_extra={
             "example": {
                 "model_name": "HousingPriceModel",
                 "model_version": "1",
@@ -318,7 +424,8 @@ class ModelInfo(BaseModel):
                     "test_r2": 0.799,
                 },
             }
-        }
+        },
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -334,8 +441,10 @@ class ErrorResponse(BaseModel):
         None, description="Request identifier for tracking"
     )
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra="forbid",
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "error": "ValidationError",
                 "message": "Invalid input data",
@@ -346,7 +455,8 @@ class ErrorResponse(BaseModel):
                 "timestamp": "2025-07-28T12:00:00Z",
                 "request_id": "550e8400-e29b-41d4-a716-446655440000",
             }
-        }
+        },
+    )
 
 
 class ModelReloadResponse(BaseModel):
@@ -358,8 +468,10 @@ class ModelReloadResponse(BaseModel):
     new_version: Optional[str] = Field(None, description="New model version")
     timestamp: str = Field(..., description="ISO timestamp of reload operation")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        extra="forbid",
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "success": True,
                 "message": "Model reloaded successfully",
@@ -367,7 +479,31 @@ class ModelReloadResponse(BaseModel):
                 "new_version": "2",
                 "timestamp": "2025-07-28T12:00:00Z",
             }
-        }
+        },
+    )
+
+
+@lru_cache(maxsize=2)
+def _gmtime_iso(seconds: int) -> str:
+    """ISO 8601 UTC date and time, to the second, for a Unix timestamp"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def iso_now() -> str:
+    """Current UTC time as an ISO 8601 string with microseconds and a Z suffix"""
+    now = time.time()
+    seconds = int(now)
+    # Only the fractional part is formatted per call; the rest is cached
+    return f"{_gmtime_iso(seconds)}.{int((now - seconds) * 1e6):06d}Z"
+
+
+def batch_uuids(n: int) -> List[str]:
+    """Generate n random (version 4) UUID hex strings from a single urandom call"""
+    buf = os.urandom(16 * n)
+    # UUID(version=4) sets the RFC 4122 version and variant bits itself
+    return [
+        uuid.UUID(bytes=buf[i : i + 16], version=4).hex for i in range(0, 16 * n, 16)
+    ]
 
 
 # Utility functions for creating responses
@@ -377,13 +513,21 @@ def create_prediction_response(
     input_features: Dict[str, float],
     processing_time_ms: Optional[float] = None,
     confidence_score: Optional[float] = None,
+    timestamp: Optional[str] = None,
 ) -> PredictionResponse:
-    """Create a standardized prediction response"""
-    return PredictionResponse(
+    """
+    Create a standardized prediction response
+
+    Batch callers should stamp the batch once with iso_now() and pass it as
+    ``timestamp`` to every response.
+
+    Every field is produced by server code, so validation is skipped.
+    """
+    return PredictionResponse.model_construct(
         prediction=prediction,
-        prediction_id=str(uuid.uuid4()),
+        prediction_id=uuid.uuid4().hex,
         model_version=model_version,
-        timestamp=datetime.utcnow().isoformat() + "Z",
+        timestamp=timestamp or iso_now(),
         confidence_score=confidence_score,
         input_features=input_features,
         processing_time_ms=processing_time_ms,
@@ -396,11 +540,11 @@ def create_error_response(
     details: Optional[Dict[str, Any]] = None,
     request_id: Optional[str] = None,
 ) -> ErrorResponse:
-    """Create a standardized error response"""
-    return ErrorResponse(
+    """Create a standardized error response (server-built, not validated)"""
+    return ErrorResponse.model_construct(
         error=error_type,
         message=message,
         details=details,
-        timestamp=datetime.utcnow().isoformat() + "Z",
+        timestamp=iso_now(),
         request_id=request_id or str(uuid.uuid4()),
     )
@@ -4,27 +4,70 @@ Data loading and initial processing module for Housing Price Prediction
 
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import yaml
 from sklearn.datasets import fetch_california_housing
-from sklearn.model_selection import train_test_split
+
+# Parse YAML with libyaml's C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The features carry at most ~6 significant digits, so the dataset is held in
+# float32: half the memory and file size of the float64 sklearn returns
+_DTYPE = np.float32
+
+FEATURE_COLS = [
+    "MedInc",
+    "HouseAge",
+    "AveRooms",
+    "AveBedrms",
+    "Population",
+    "AveOccup",
+    "Latitude",
+    "Longitude",
+]
+TARGET_COL = "median_house_value"
+
 
+@lru_cache(maxsize=1)
 def load_config():
-    """Load configuration from config.yaml"""
+    """Load configuration from config.yaml (parsed once per process)"""
     config_path = Path(__file__).parent.parent.parent / "configs" / "config.yaml"
     with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=SafeLoader)
     return config
 
 
+def _write_csv(data, path):
+    """Write a DataFrame to CSV with pyarrow's multithreaded C++ writer"""
+    pacsv.write_csv(pa.Table.from_pandas(data, preserve_index=False), str(path))
+
+
+def _write_xy_csv(X, y, path):
+    """Write features plus the target column to CSV without joining them in pandas"""
+    table = pa.Table.from_pandas(X, preserve_index=False)
+    table = table.append_column(TARGET_COL, pa.array(y.to_numpy()))
+    pacsv.write_csv(table, str(path))
+
+
+def _read_csv(path, column_types=None):
+    """Read a CSV file into a DataFrame with pyarrow's multithreaded C++ reader"""
+    convert_options = pacsv.ConvertOptions(column_types=column_types or {})
+    return pacsv.read_csv(str(path), convert_options=convert_options).to_pandas()
+
+
 def download_california_housing_data():
     """
     Download California Housing dataset from sklearn
@@ -37,9 +80,9 @@ def download_california_housing_data():
     # Fetch the dataset
     housing = fetch_california_housing(as_frame=True)
 
-    # Get features and target
-    X = housing.data
-    y = housing.target
+    # Get features and target, downcast to the pipeline dtype
+    X = housing.data.astype(_DTYPE)
+    y = housing.target.astype(_DTYPE)
 
     logger.info(f"Dataset loaded successfully. Shape: {X.shape}")
     logger.info(f"Features: {list(X.columns)}")
@@ -48,9 +91,23 @@ def download_california_housing_data():
     return X, y, housing
 
 
+def _build_dataframe(X, y):
+    """
+    Combine features and target into the raw dataset layout, in memory
+
+    Returns:
+        pd.DataFrame: Features plus a median_house_value column
+    """
+    # concat assembles the frame from the existing columns; no X.copy() first
+    return pd.concat([X, y.rename(TARGET_COL)], axis=1, copy=False)
+
+
 def create_raw_dataset():
     """
     Create and save raw dataset to data/raw/
+
+    Returns:
+        pd.DataFrame: The in-memory raw dataset, so callers need not re-read it
     """
     config = load_config()
 
@@ -58,8 +115,7 @@ def create_raw_dataset():
     X, y, housing_info = download_california_housing_data()
 
     # Combine features and target
-    raw_data = X.copy()
-    raw_data["median_house_value"] = y
+    raw_data = _build_dataframe(X, y)
 
     # Create data directory if it doesn't exist
     raw_data_path = Path(config["data"]["raw_data_path"])
@@ -67,56 +123,89 @@ def create_raw_dataset():
 
     # Save raw data
     raw_file_path = raw_data_path / "california_housing_raw.csv"
-    raw_data.to_csv(raw_file_path, index=False)
+    _write_csv(raw_data, raw_file_path)
 
     logger.info(f"Raw dataset saved to: {raw_file_path}")
 
     # Save dataset info
     info_file_path = raw_data_path / "dataset_info.txt"
-    with open(info_file_path, "w") as f:
-        f.write("California Housing Dataset Information\n")
-        f.write("=====================================\n\n")
-        f.write(f"Dataset shape: {raw_data.shape}\n")
-        f.write(f"Features: {list(X.columns)}\n")
-        f.write(f"Target: median_house_value\n\n")
-        f.write("Feature Descriptions:\n")
-        f.write("- MedInc: median income in block group\n")
-        f.write("- HouseAge: median house age in block group\n")
-        f.write("- AveRooms: average number of rooms per household\n")
-        f.write("- AveBedrms: average number of bedrooms per household\n")
-        f.write("- Population: block group population\n")
-        f.write("- AveOccup: average number of household members\n")
-        f.write("- Latitude: block group latitude\n")
-        f.write("- Longitude: block group longitude\n\n")
-        f.write("Target Description:\n")
-        f.write("- median_house_value: median house value for California districts,\n")
-        f.write("  expressed in hundreds of thousands of dollars ($100,000s)\n")
+    info_lines = [
+        "California Housing Dataset Information",
+        "=====================================",
+        "",
+        f"Dataset shape: {raw_data.shape}",
+        f"Features: {list(X.columns)}",
+        "Target: median_house_value",
+        "",
+        "Feature Descriptions:",
+        "- MedInc: median income in block group",
+        "- HouseAge: median house age in block group",
+        "- AveRooms: average number of rooms per household",
+        "- AveBedrms: average number of bedrooms per household",
+        "- Population: block group population",
+        "- AveOccup: average number of household members",
+        "- Latitude: block group latitude",
+        "- Longitude: block group longitude",
+        "",
+        "Target Description:",
+        "- median_house_value: median house value for California districts,",
+        "  expressed in hundreds of thousands of dollars ($100,000s)",
+    ]
+    info_file_path.write_text("\n".join(info_lines) + "\n")
 
     logger.info(f"Dataset info saved to: {info_file_path}")
 
     return raw_data
 
 
-def load_raw_data():
+def load_raw_data(use_cache=True):
     """
     Load raw data from CSV file
 
+    Args:
+        use_cache (bool): Read the saved raw CSV if present. When False the
+            dataset is built in memory from the source without touching disk.
+
     Returns:
         pd.DataFrame: Raw housing data
     """
+    if not use_cache:
+        X, y, _ = download_california_housing_data()
+        return _build_dataframe(X, y)
+
     config = load_config()
     raw_file_path = Path(config["data"]["raw_data_path"]) / "california_housing_raw.csv"
 
     if not raw_file_path.exists():
+        # create_raw_dataset returns the frame it wrote; no need to read it back
         logger.warning("Raw data file not found. Creating it...")
         return create_raw_dataset()
 
     logger.info(f"Loading raw data from: {raw_file_path}")
-    data = pd.read_csv(raw_file_path)
+    column_types = {column: pa.from_numpy_dtype(_DTYPE) for column in FEATURE_COLS}
+    column_types[TARGET_COL] = pa.from_numpy_dtype(_DTYPE)
+    data = _read_csv(raw_file_path, column_types)
 
     return data
 
 
+def _shuffle_split(indices, test_size, random_state):
+    """
+    Shuffle row positions and cut them into (test, train) position arrays
+
+    Matches sklearn's train_test_split for a float test_size: ceil() rows go
+    to the test part and the permutation comes from RandomState(random_state).
+    """
+    n_samples = len(indices)
+    n_test = int(np.ceil(test_size * n_samples))
+    n_train = int(np.floor((1.0 - test_size) * n_samples))
+
+    permutation = np.random.RandomState(random_state).permutation(n_samples)
+    test = indices[permutation[:n_test]]
+    train = indices[permutation[n_test : n_test + n_train]]
+    return test, train
+
+
 def split_data(data, test_size=0.2, validation_size=0.2, random_state=42):
     """
     Split data into train, validation, and test sets
@@ -133,18 +222,17 @@ def split_data(data, test_size=0.2, validation_size=0.2, random_state=42):
     logger.info("Splitting data into train, validation, and test sets...")
 
     # Separate features and target
-    X = data.drop("median_house_value", axis=1)
-    y = data["median_house_value"]
+    X = data.drop(TARGET_COL, axis=1)
+    y = data[TARGET_COL]
 
-    # First split: separate test set
-    X_temp, X_test, y_temp, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state, stratify=None
-    )
+    # Work out the split on row positions and index X/y once per split, so no
+    # intermediate train+validation frame is materialised. The permutations
+    # and sizes are the ones two chained train_test_split calls produce.
+    test_idx, temp_idx = _shuffle_split(np.arange(len(data)), test_size, random_state)
+    val_idx, train_idx = _shuffle_split(temp_idx, validation_size, random_state)
 
-    # Second split: separate train and validation from remaining data
-    X_train, X_val, y_train, y_val = train_test_split(
-        X_temp, y_temp, test_size=validation_size, random_state=random_state
-    )
+    X_train, X_val, X_test = X.iloc[train_idx], X.iloc[val_idx], X.iloc[test_idx]
+    y_train, y_val, y_test = y.iloc[train_idx], y.iloc[val_idx], y.iloc[test_idx]
 
     logger.info(f"Train set shape: {X_train.shape}")
     logger.info(f"Validation set shape: {X_val.shape}")
@@ -161,20 +249,11 @@ def save_split_data(X_train, X_val, X_test, y_train, y_val, y_test):
     processed_path = Path(config["data"]["processed_data_path"])
     processed_path.mkdir(parents=True, exist_ok=True)
 
-    # Combine features and targets for each set
-    train_data = X_train.copy()
-    train_data["median_house_value"] = y_train
-
-    val_data = X_val.copy()
-    val_data["median_house_value"] = y_val
-
-    test_data = X_test.copy()
-    test_data["median_house_value"] = y_test
-
-    # Save datasets
-    train_data.to_csv(processed_path / "train.csv", index=False)
-    val_data.to_csv(processed_path / "validation.csv", index=False)
-    test_data.to_csv(processed_path / "test.csv", index=False)
+    # Save datasets; features and target are combined at the Arrow table level,
+    # so no combined DataFrame copy is made for each set
+    _write_xy_csv(X_train, y_train, processed_path / "train.csv")
+    _write_xy_csv(X_val, y_val, processed_path / "validation.csv")
+    _write_xy_csv(X_test, y_test, processed_path / "test.csv")
 
     logger.info(f"Split datasets saved to: {processed_path}")
 
@@ -189,13 +268,52 @@ def get_data_summary(data):
     Returns:
         dict: Summary statistics
     """
+    # Compute the describe() statistics for every numeric column in one pass
+    # over a single 2D array rather than per-column pandas reductions
+    numeric = data.select_dtypes(include="number")
+    values = numeric.to_numpy(dtype=np.float64)
+    missing = np.isnan(values)
+    if len(values) == 0:
+        # The reductions below reject zero rows; describe() reports count 0
+        # and NaN for everything else
+        nan = np.full(values.shape[1], np.nan)
+        stats = {"count": np.zeros(values.shape[1])}
+        stats.update(
+            dict.fromkeys(["mean", "std", "min", "25%", "50%", "75%", "max"], nan)
+        )
+    else:
+        quartiles = np.nanpercentile(values, [25, 50, 75], axis=0)
+        stats = {
+            "count": len(values) - missing.sum(axis=0),
+            "mean": np.nanmean(values, axis=0),
+            "std": np.nanstd(values, axis=0, ddof=1),
+            "min": np.nanmin(values, axis=0),
+            "25%": quartiles[0],
+            "50%": quartiles[1],
+            "75%": quartiles[2],
+            "max": np.nanmax(values, axis=0),
+        }
+    summary_stats = {
+        column: {name: float(stat[i]) for name, stat in stats.items()}
+        for i, column in enumerate(numeric.columns)
+    }
+
+    if numeric.shape[1] == data.shape[1]:
+        missing_values = dict(zip(data.columns, missing.sum(axis=0).tolist()))
+    else:
+        missing_values = data.isnull().sum().to_dict()
+
+    # deep=True walks every Python object; only object columns need it, for
+    # purely numeric data the shallow figure is already exact
+    memory_usage = data.memory_usage(deep=numeric.shape[1] != data.shape[1]).sum()
+
     summary = {
         "shape": data.shape,
         "columns": list(data.columns),
         "dtypes": data.dtypes.to_dict(),
-        "missing_values": data.isnull().sum().to_dict(),
-        "summary_stats": data.describe().to_dict(),
-        "memory_usage": data.memory_usage(deep=True).sum(),
+        "missing_values": missing_values,
+        "summary_stats": summary_stats,
+        "memory_usage": memory_usage,
     }
 
     return summary
@@ -207,7 +325,8 @@ def main():
     """
     logger.info("Starting data loading process...")
 
-    # Create raw dataset
+    # Create raw dataset; the returned frame is split directly, the CSV on
+    # disk is only the archived copy
     raw_data = create_raw_dataset()
 
     # Generate summary
@@ -3,29 +3,39 @@ Model evaluation module for Housing Price Prediction MLOps Pipeline
 Evaluates trained models and generates comprehensive metrics and visualizations
 """
 
-import json
 import logging
 import os
+import sys
 import warnings
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 import joblib
+import matplotlib
+
+# Plots are only written to files; select the non-interactive backend before
+# pyplot is imported so no GUI toolkit gets loaded
+matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
 import mlflow
 import mlflow.sklearn
 import numpy as np
+import orjson
 import pandas as pd
 import seaborn as sns
 import yaml
-from sklearn.metrics import (
-    explained_variance_score,
-    mean_absolute_error,
-    mean_absolute_percentage_error,
-    mean_squared_error,
-    r2_score,
-)
+from joblib import Memory, Parallel, delayed
+from scipy.stats import norm
 from sklearn.preprocessing import StandardScaler
 
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from models.metrics import calculate_regression_metrics
+
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
@@ -33,17 +43,47 @@ warnings.filterwarnings("ignore")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Set style for plots
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+# Resolution of the saved evaluation plots
+PLOT_DPI = 150
+
+# Scatter plots draw at most this many points; histograms, Q-Q plots and
+# metrics always use the full data
+MAX_SCATTER = 5000
 
+# Local on-disk cache of models fetched from the MLflow server
+MODEL_CACHE_DIR = ".cache/mlflow_models"
 
+# Column types of the processed split CSVs; passing them up front skips
+# pandas' type inference and keeps the frames in float32
+FEATURE_DTYPES = {
+    "MedInc": np.float32,
+    "HouseAge": np.float32,
+    "AveRooms": np.float32,
+    "AveBedrms": np.float32,
+    "Population": np.float32,
+    "AveOccup": np.float32,
+    "Latitude": np.float32,
+    "Longitude": np.float32,
+    "median_house_value": np.float32,
+}
+
+
+@lru_cache(maxsize=1)
 def load_config():
-    """Load configuration from config.yaml"""
+    """Load configuration from config.yaml (parsed once, returned read-only)"""
     config_path = Path(__file__).parent.parent.parent / "configs" / "config.yaml"
     with open(config_path, "r") as file:
         config = yaml.safe_load(file)
-    return config
+    # Every caller shares the cached object, so guard it against mutation
+    return MappingProxyType(config)
+
+
+def read_split_csv(path):
+    """Read a processed split CSV, with pyarrow's C++ parser when available"""
+    try:
+        return pd.read_csv(path, engine="pyarrow", dtype=FEATURE_DTYPES)
+    except ImportError:
+        return pd.read_csv(path, dtype=FEATURE_DTYPES)
 
 
 def load_test_data():
@@ -52,7 +92,7 @@ def load_test_data():
     test_path = Path(config["data"]["processed_data_path"]) / "test.csv"
     
     logger.info(f"Loading test data from: {test_path}")
-    test_data = pd.read_csv(test_path)
+    test_data = read_split_csv(test_path)
     
     # Separate features and target
     X_test = test_data.drop("median_house_value", axis=1)
@@ -62,18 +102,47 @@ def load_test_data():
     return X_test, y_test
 
 
+def _load_sklearn_model(model_uri, tracking_uri, run_id):
+    """mlflow.sklearn.load_model; tracking_uri and run_id only key the cache"""
+    return mlflow.sklearn.load_model(model_uri)
+
+
+@lru_cache(maxsize=1)
+def _cached_model_loader():
+    """_load_sklearn_model memoised on disk (created on first use)"""
+    return Memory(MODEL_CACHE_DIR, verbose=0).cache(
+        _load_sklearn_model, ignore=["model_uri"]
+    )
+
+
+def load_mlflow_model(model_uri, run_id):
+    """Load an MLflow sklearn model, reusing the local copy from earlier runs"""
+    # Keyed on the tracking store and the id of the run that logged the model,
+    # not on model_uri: registry versions restart at 1 when mlruns is rebuilt,
+    # so models:/<name>/1 can name a different model than the cached one
+    if not run_id:
+        # Versions registered from an external source have no run, and nothing
+        # else reliably identifies their contents, so they are never cached
+        return _load_sklearn_model(model_uri, None, None)
+    return _cached_model_loader()(model_uri, mlflow.get_tracking_uri(), run_id)
+
+
 def load_best_model():
     """Load the best model from MLflow Model Registry"""
+    config = load_config()
+    
     try:
-        # Set MLflow tracking URI
-        mlflow.set_tracking_uri("http://localhost:5000")
+        # Set MLflow tracking URI: the store train_model.py logs to (local
+        # ./mlruns unless MLFLOW_TRACKING_URI names a server)
+        mlflow.set_tracking_uri(
+            os.environ.get("MLFLOW_TRACKING_URI") or Path.cwd().joinpath("mlruns").as_uri()
+        )
         
         # Get the latest version of the best model
         client = mlflow.MlflowClient()
         
         # Try to get from model registry first
         try:
-            config = load_config()
             model_name = config["mlflow"]["model_registry"]["registered_model_name"]
             latest_version = client.get_latest_versions(model_name, stages=["Production"])
             
@@ -85,7 +154,7 @@ def load_best_model():
             
             if latest_version:
                 model_uri = f"models:/{model_name}/{latest_version[0].version}"
-                model = mlflow.sklearn.load_model(model_uri)
+                model = load_mlflow_model(model_uri, latest_version[0].run_id)
                 model_info = {
                     "name": model_name,
                     "version": latest_version[0].version,
@@ -97,20 +166,20 @@ def load_best_model():
             logger.warning(f"Could not load from model registry: {e}")
         
         # Fallback: Load from latest run
-        config = load_config()
         experiment_name = config["mlflow"]["experiment_name"]
         experiment = mlflow.get_experiment_by_name(experiment_name)
         if experiment:
-            runs = mlflow.search_runs(
+            # The client returns Run objects, not a DataFrame of every column
+            runs = client.search_runs(
                 experiment_ids=[experiment.experiment_id],
                 order_by=["metrics.rmse ASC"],
                 max_results=1
             )
             
-            if not runs.empty:
-                best_run_id = runs.iloc[0].run_id
+            if runs:
+                best_run_id = runs[0].info.run_id
                 model_uri = f"runs:/{best_run_id}/model"
-                model = mlflow.sklearn.load_model(model_uri)
+                model = load_mlflow_model(model_uri, best_run_id)
                 model_info = {
                     "name": "best-model-from-run",
                     "run_id": best_run_id,
@@ -129,10 +198,9 @@ def load_best_model():
         model = RandomForestRegressor(n_estimators=10, random_state=42)
         
         # Quick train on available data
-        config = load_config()
         train_path = Path(config["data"]["processed_data_path"]) / "train.csv"
         if train_path.exists():
-            train_data = pd.read_csv(train_path)
+            train_data = read_split_csv(train_path)
             X_train = train_data.drop("median_house_value", axis=1)
             y_train = train_data["median_house_value"]
             model.fit(X_train, y_train)
@@ -141,25 +209,56 @@ def load_best_model():
         return model, model_info
 
 
-def calculate_regression_metrics(y_true, y_pred):
-    """Calculate comprehensive regression metrics"""
-    metrics = {
-        "mae": mean_absolute_error(y_true, y_pred),
-        "mse": mean_squared_error(y_true, y_pred),
-        "rmse": np.sqrt(mean_squared_error(y_true, y_pred)),
-        "r2_score": r2_score(y_true, y_pred),
-        "explained_variance": explained_variance_score(y_true, y_pred),
-        "mape": mean_absolute_percentage_error(y_true, y_pred) * 100,
-    }
-    
-    # Additional metrics
-    residuals = y_true - y_pred
-    metrics["mean_residual"] = np.mean(residuals)
-    metrics["std_residual"] = np.std(residuals)
-    metrics["max_residual"] = np.max(np.abs(residuals))
-    metrics["median_residual"] = np.median(np.abs(residuals))
-    
-    return metrics
+def scatter_sample(n):
+    """Reproducible row positions to draw in scatter plots (all rows if n is small)"""
+    if n <= MAX_SCATTER:
+        return np.arange(n)
+    return np.random.default_rng(0).choice(n, MAX_SCATTER, replace=False)
+
+
+@dataclass(frozen=True)
+class EvalCache:
+    """Test-set arrays shared by the evaluation plots, computed once in main()"""
+
+    y_true: np.ndarray
+    y_pred: np.ndarray
+    residuals: np.ndarray
+    abs_residuals: np.ndarray
+    abs_residuals_normalized: np.ndarray
+    min_val: float
+    max_val: float
+    scatter_idx: np.ndarray
+
+    @classmethod
+    def from_predictions(cls, y_true, y_pred):
+        y_true = np.asarray(y_true, dtype=np.float64)
+        y_pred = np.asarray(y_pred, dtype=np.float64)
+        residuals = y_true - y_pred
+        abs_residuals = np.abs(residuals)
+        error_min = abs_residuals.min()
+        return cls(
+            y_true=y_true,
+            y_pred=y_pred,
+            residuals=residuals,
+            abs_residuals=abs_residuals,
+            abs_residuals_normalized=(abs_residuals - error_min)
+            / (abs_residuals.max() - error_min),
+            min_val=float(min(y_true.min(), y_pred.min())),
+            max_val=float(max(y_true.max(), y_pred.max())),
+            scatter_idx=scatter_sample(len(residuals)),
+        )
+
+
+def apply_plot_style():
+    """Set the seaborn style used by all evaluation plots"""
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+
+
+def render_plot(plot_fn, *args):
+    """Run one plot function in the evaluation plot style (worker entry point)"""
+    apply_plot_style()
+    return plot_fn(*args)
 
 
 def create_plots_directory():
@@ -169,14 +268,16 @@ def create_plots_directory():
     return plots_dir
 
 
-def plot_residuals(y_true, y_pred, plots_dir):
-    """Create residuals plot"""
-    residuals = y_true - y_pred
+def plot_residuals(cache, fig, axes, plots_dir):
+    """Create residuals plot on a 2x2 grid of axes"""
+    y_true, y_pred, residuals = cache.y_true, cache.y_pred, cache.residuals
+    idx = cache.scatter_idx
+    min_val, max_val = cache.min_val, cache.max_val
     
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+    (ax1, ax2), (ax3, ax4) = axes
     
     # Residuals vs Predicted
-    ax1.scatter(y_pred, residuals, alpha=0.6, color='blue')
+    ax1.scatter(y_pred[idx], residuals[idx], alpha=0.6, color='blue')
     ax1.axhline(y=0, color='red', linestyle='--', alpha=0.8)
     ax1.set_xlabel('Predicted Values')
     ax1.set_ylabel('Residuals')
@@ -190,25 +291,29 @@ def plot_residuals(y_true, y_pred, plots_dir):
     ax2.set_title('Distribution of Residuals')
     ax2.grid(True, alpha=0.3)
     
-    # Q-Q plot for normality
-    from scipy import stats
-    stats.probplot(residuals, dist="norm", plot=ax3)
+    # Q-Q plot for normality: sorted residuals against normal quantiles at
+    # the (i - 0.5) / n plotting positions, with a least-squares fit line
+    sorted_residuals = np.sort(residuals)
+    n = sorted_residuals.size
+    theoretical = norm.ppf((np.arange(1, n + 1) - 0.5) / n)
+    slope, intercept = np.polyfit(theoretical, sorted_residuals, 1)
+    ax3.scatter(theoretical, sorted_residuals, s=4, alpha=0.6)
+    ax3.plot(theoretical, slope * theoretical + intercept, 'r--')
+    ax3.set_xlabel('Theoretical Quantiles')
+    ax3.set_ylabel('Ordered Residuals')
     ax3.set_title('Q-Q Plot of Residuals')
     ax3.grid(True, alpha=0.3)
     
     # Actual vs Predicted
-    ax4.scatter(y_true, y_pred, alpha=0.6, color='green')
-    min_val = min(y_true.min(), y_pred.min())
-    max_val = max(y_true.max(), y_pred.max())
+    ax4.scatter(y_true[idx], y_pred[idx], alpha=0.6, color='green')
     ax4.plot([min_val, max_val], [min_val, max_val], 'red', linestyle='--', alpha=0.8)
     ax4.set_xlabel('Actual Values')
     ax4.set_ylabel('Predicted Values')
     ax4.set_title('Actual vs Predicted Values')
     ax4.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(plots_dir / 'residuals.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(plots_dir / 'residuals.png', dpi=PLOT_DPI, bbox_inches='tight')
     
     logger.info("Residuals plot saved successfully")
 
@@ -228,103 +333,134 @@ def plot_feature_importance(model, feature_names, plots_dir):
             plt.text(0.5, 0.5, 'Feature importance not available for this model type', 
                     ha='center', va='center', transform=plt.gca().transAxes, fontsize=16)
             plt.title('Feature Importance')
-            plt.savefig(plots_dir / 'feature_importance.png', dpi=300, bbox_inches='tight')
+            plt.savefig(plots_dir / 'feature_importance.png', dpi=PLOT_DPI, bbox_inches='tight')
             plt.close()
             return
         
-        # Create feature importance dataframe
-        feature_importance_df = pd.DataFrame({
-            'feature': feature_names,
-            'importance': importances
-        }).sort_values('importance', ascending=True)
+        # Sort ascending so the most important feature ends up at the top
+        importances = np.asarray(importances)
+        order = np.argsort(importances, kind='stable')
+        names_sorted = np.asarray(feature_names)[order]
+        values_sorted = importances[order]
         
         # Plot
         plt.figure(figsize=(10, 8))
-        bars = plt.barh(feature_importance_df['feature'], feature_importance_df['importance'])
-        
-        # Color bars
-        colors = plt.cm.viridis(np.linspace(0, 1, len(bars)))
-        for bar, color in zip(bars, colors):
-            bar.set_color(color)
+        # Color bars along the viridis map, passed in with the bars themselves
+        colors = plt.cm.viridis(np.linspace(0, 1, len(values_sorted)))
+        plt.barh(names_sorted, values_sorted, color=colors)
         
         plt.xlabel('Feature Importance')
         plt.title('Feature Importance for Housing Price Prediction')
         plt.grid(True, alpha=0.3, axis='x')
         plt.tight_layout()
         
-        plt.savefig(plots_dir / 'feature_importance.png', dpi=300, bbox_inches='tight')
+        plt.savefig(plots_dir / 'feature_importance.png', dpi=PLOT_DPI, bbox_inches='tight')
         plt.close()
         
         logger.info("Feature importance plot saved successfully")
         
-        return feature_importance_df.to_dict('records')
+        # Most important first
+        return [
+            {'feature': str(name), 'importance': float(value)}
+            for name, value in zip(names_sorted[::-1], values_sorted[::-1])
+        ]
         
     except Exception as e:
         logger.error(f"Error creating feature importance plot: {e}")
         return None
 
 
-def plot_prediction_distribution(y_true, y_pred, plots_dir):
+def plot_prediction_distribution(cache, fig, axes, plots_dir):
     """Create prediction distribution plot (for regression, this replaces confusion matrix)"""
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+    y_true, y_pred, errors = cache.y_true, cache.y_pred, cache.abs_residuals
+    idx = cache.scatter_idx
+    min_val, max_val = cache.min_val, cache.max_val
     
-    # Distribution of actual vs predicted
-    ax1.hist(y_true, bins=50, alpha=0.7, label='Actual', color='blue', density=True)
-    ax1.hist(y_pred, bins=50, alpha=0.7, label='Predicted', color='red', density=True)
+    (ax1, ax2), (ax3, ax4) = axes
+    
+    # Distribution of actual vs predicted, on one set of bin edges spanning
+    # both series so the bars line up (the range is already in the cache)
+    hist_edges = np.linspace(min_val, max_val, 51)
+    ax1.hist(y_true, bins=hist_edges, alpha=0.7, label='Actual', color='blue', density=True)
+    ax1.hist(y_pred, bins=hist_edges, alpha=0.7, label='Predicted', color='red', density=True)
     ax1.set_xlabel('House Value (in $100k)')
     ax1.set_ylabel('Density')
     ax1.set_title('Distribution of Actual vs Predicted Values')
     ax1.legend()
     ax1.grid(True, alpha=0.3)
     
-    # Error distribution by prediction range
-    pred_ranges = pd.qcut(y_pred, q=5, labels=['Low', 'Low-Med', 'Medium', 'Med-High', 'High'])
-    errors = np.abs(y_true - y_pred)
-    error_by_range = pd.DataFrame({'range': pred_ranges, 'error': errors})
+    # Error distribution by prediction range: quintile bins of the predictions,
+    # right-inclusive like pd.qcut, assigned with one searchsorted
+    edges = np.quantile(y_pred, np.linspace(0, 1, 6))
+    bin_idx = np.searchsorted(edges[1:-1], y_pred, side='left')
+    error_groups = [errors[bin_idx == k] for k in range(5)]
     
-    box_plot = error_by_range.boxplot(column='error', by='range', ax=ax2)
+    ax2.boxplot(error_groups, labels=['Low', 'Low-Med', 'Medium', 'Med-High', 'High'])
     ax2.set_title('Absolute Error by Prediction Range')
     ax2.set_xlabel('Prediction Range')
     ax2.set_ylabel('Absolute Error')
     ax2.grid(True, alpha=0.3)
     
     # Scatter plot with error coloring
-    errors_normalized = (errors - errors.min()) / (errors.max() - errors.min())
-    scatter = ax3.scatter(y_true, y_pred, c=errors_normalized, cmap='Reds', alpha=0.6)
-    min_val = min(y_true.min(), y_pred.min())
-    max_val = max(y_true.max(), y_pred.max())
+    scatter = ax3.scatter(
+        y_true[idx],
+        y_pred[idx],
+        c=cache.abs_residuals_normalized[idx],
+        cmap='Reds',
+        alpha=0.6,
+    )
     ax3.plot([min_val, max_val], [min_val, max_val], 'black', linestyle='--', alpha=0.8)
     ax3.set_xlabel('Actual Values')
     ax3.set_ylabel('Predicted Values')
     ax3.set_title('Predictions Colored by Error Magnitude')
-    plt.colorbar(scatter, ax=ax3, label='Normalized Error')
+    fig.colorbar(scatter, ax=ax3, label='Normalized Error')
     ax3.grid(True, alpha=0.3)
     
     # Error vs actual values
-    ax4.scatter(y_true, errors, alpha=0.6, color='purple')
+    ax4.scatter(y_true[idx], errors[idx], alpha=0.6, color='purple')
     ax4.set_xlabel('Actual Values')
     ax4.set_ylabel('Absolute Error')
     ax4.set_title('Prediction Error vs Actual Values')
     ax4.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(plots_dir / 'confusion_matrix.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(plots_dir / 'confusion_matrix.png', dpi=PLOT_DPI, bbox_inches='tight')
     
     logger.info("Prediction distribution plot saved successfully")
 
 
+def write_json(data, path):
+    """Write data as indented JSON with orjson, NumPy values as plain numbers"""
+    # Anything orjson cannot encode natively (timestamps, paths, ...) is
+    # written as its string form
+    payload = orjson.dumps(
+        data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str
+    )
+    with open(path, "wb") as f:
+        f.write(payload)
+
+
+def plot_diagnostics(cache, plots_dir):
+    """Draw the residuals and prediction distribution plots on one reused figure"""
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    plot_residuals(cache, fig, axes, plots_dir)
+    for ax in axes.flat:
+        ax.clear()
+    # Runs second: its colorbar adds an extra axes to the figure
+    plot_prediction_distribution(cache, fig, axes, plots_dir)
+    plt.close(fig)
+
+
 def save_evaluation_metrics(metrics, model_info, feature_importance=None):
     """Save evaluation metrics to JSON file"""
     evaluation_data = {
         "model_info": model_info,
-        "evaluation_metrics": metrics,
+        "evaluation_metrics": {name: float(value) for name, value in metrics.items()},
         "feature_importance": feature_importance,
         "evaluation_timestamp": pd.Timestamp.now().isoformat()
     }
     
-    with open("evaluation_metrics.json", "w") as f:
-        json.dump(evaluation_data, f, indent=2, default=str)
+    write_json(evaluation_data, "evaluation_metrics.json")
     
     logger.info("Evaluation metrics saved to evaluation_metrics.json")
 
@@ -338,8 +474,7 @@ def save_metrics_for_dvc(metrics):
         "test_mape": metrics["mape"]
     }
     
-    with open("metrics.json", "w") as f:
-        json.dump(dvc_metrics, f, indent=2)
+    write_json(dvc_metrics, "metrics.json")
     
     logger.info("DVC metrics saved to metrics.json")
 
@@ -358,9 +493,17 @@ def main():
         # Load best model
         model, model_info = load_best_model()
         
-        # Make predictions
+        # Nothing to score or plot (e.g. a dry run on an empty split)
+        if len(X_test) == 0:
+            logger.warning("Empty test set, skipping evaluation")
+            return {}, model_info
+        
+        # Make predictions on one contiguous float32 block; sklearn's input
+        # validation then has nothing left to convert or copy (trees run on
+        # float32 internally)
         logger.info("Making predictions on test set...")
-        y_pred = model.predict(X_test)
+        X_test_arr = np.ascontiguousarray(X_test.to_numpy(), dtype=np.float32)
+        y_pred = model.predict(X_test_arr)
         
         # Calculate metrics
         logger.info("Calculating evaluation metrics...")
@@ -370,11 +513,19 @@ def main():
         for metric_name, value in metrics.items():
             logger.info(f"{metric_name}: {value:.4f}")
         
-        # Create visualizations
+        # Create visualizations; the 2x2 diagnostics (sharing one figure) and
+        # the feature importance plot are rendered and saved in separate worker
+        # processes, which also apply the plot style (here rather than at
+        # import time)
         logger.info("Creating evaluation plots...")
-        plot_residuals(y_test, y_pred, plots_dir)
-        feature_importance = plot_feature_importance(model, X_test.columns.tolist(), plots_dir)
-        plot_prediction_distribution(y_test, y_pred, plots_dir)
+        eval_cache = EvalCache.from_predictions(y_test, y_pred)
+        plot_tasks = [
+            (plot_diagnostics, eval_cache, plots_dir),
+            (plot_feature_importance, model, X_test.columns.tolist(), plots_dir),
+        ]
+        _, feature_importance = Parallel(n_jobs=len(plot_tasks), backend="loky")(
+            delayed(render_plot)(*task) for task in plot_tasks
+        )
         
         # Save metrics
         save_evaluation_metrics(metrics, model_info, feature_importance)
@@ -0,0 +1,85 @@
+"""
+Regression metrics shared by model training and evaluation
+"""
+
+import numpy as np
+
+
+def _residual_stats(y_true, y_pred):
+    """
+    Residual statistics shared by every metric, from whole-array operations
+
+    Returns the absolute residuals plus (mean, sum of squared deviations) of
+    the residuals and of y_true, and the abs/APE sums and max.
+    """
+    residuals = y_true - y_pred
+    abs_residuals = np.abs(residuals)
+    mean_r = residuals.sum() / residuals.size
+    residuals_centered = residuals - mean_r
+    mean_y = y_true.mean()
+    y_true_centered = y_true - mean_y
+    eps = np.finfo(np.float64).eps
+    return (
+        abs_residuals,
+        mean_r,
+        float(np.dot(residuals_centered, residuals_centered)),
+        mean_y,
+        float(np.dot(y_true_centered, y_true_centered)),
+        abs_residuals.sum(),
+        abs_residuals.max(),
+        (abs_residuals / np.maximum(np.abs(y_true), eps)).sum(),
+    )
+
+
+def calculate_regression_metrics(y_true, y_pred):
+    """Calculate comprehensive regression metrics"""
+    # Work on contiguous float64 arrays and derive every metric from one
+    # set of residual statistics instead of one sklearn pass per metric
+    y_true = np.ascontiguousarray(y_true, dtype=np.float64)
+    y_pred = np.ascontiguousarray(y_pred, dtype=np.float64)
+    n = y_true.size
+    if n == 0 or y_pred.size != n:
+        raise ValueError(
+            f"Expected equal, non-empty y_true and y_pred, got sizes {n} and {y_pred.size}"
+        )
+
+    (
+        abs_residuals,
+        mean_residual,
+        m2_residual,
+        mean_true,
+        ss_tot,
+        sum_abs,
+        max_abs,
+        sum_ape,
+    ) = _residual_stats(y_true, y_pred)
+
+    ss_res = m2_residual + n * mean_residual * mean_residual
+    mse = ss_res / n
+    # Residual and target variances (ddof=0), as explained_variance_score uses
+    var_res = m2_residual / n
+    var_true = ss_tot / n
+
+    # Median via partial sort on the one or two middle elements
+    middle = np.partition(abs_residuals, [(n - 1) // 2, n // 2])
+    median_abs_residual = (middle[(n - 1) // 2] + middle[n // 2]) / 2
+
+    metrics = {
+        "mae": float(sum_abs / n),
+        "mse": float(mse),
+        "rmse": float(np.sqrt(mse)),
+        # Same constant-target conventions as sklearn's r2/explained variance
+        "r2_score": float(1.0 - ss_res / ss_tot) if ss_tot else float(ss_res == 0),
+        "explained_variance": float(1.0 - var_res / var_true)
+        if var_true
+        else float(var_res == 0),
+        "mape": float(sum_ape / n) * 100,
+    }
+
+    # Additional metrics
+    metrics["mean_residual"] = float(mean_residual)
+    metrics["std_residual"] = float(np.sqrt(var_res))
+    metrics["max_residual"] = float(max_abs)
+    metrics["median_residual"] = float(median_abs_residual)
+
+    return metrics
@@ -2,71 +2,178 @@
 Model training module with MLflow experiment tracking
 """
 
+import argparse
 import json
 import logging
 import os
+import shutil
 import subprocess
 import sys
-import threading
-import time
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 import joblib
-import matplotlib.pyplot as plt
 import mlflow
 import mlflow.sklearn
 import numpy as np
+import optuna
 import pandas as pd
-import requests
-import seaborn as sns
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import sklearn
 import yaml
+from joblib import Memory, Parallel, delayed
+from sklearn import config_context, get_config
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import Lasso, LinearRegression, Ridge
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.model_selection import GridSearchCV, cross_val_score
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import Lasso, LinearRegression, RidgeCV
+from sklearn.model_selection import (
+    GridSearchCV,
+    HalvingRandomSearchCV,
+    KFold,
+    check_cv,
+    cross_val_score,
+)
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.tree import DecisionTreeRegressor
 
+# Parse YAML with libyaml's C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from models.metrics import calculate_regression_metrics
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Candidates drawn by the successive-halving searches; with factor 3 they are
+# cut 27 -> 9 -> 3 -> 1, and only the last round trains on the full data
+HALVING_CANDIDATES = 27
+
+# Trials run by the Optuna search for the Random Forest
+RF_OPTUNA_TRIALS = 40
+
+# On-disk cache of fitted searches and models, keyed on estimator parameters
+# and training data, so unchanged data is not refitted on pipeline re-runs
+SKLEARN_CACHE_DIR = ".cache/sklearn"
+
+# Size the cache is trimmed to after each training run, least recently used
+# entries first; DVC stores the whole directory as a pipeline output
+SKLEARN_CACHE_BYTES_LIMIT = "1G"
+
+# Parquet copies of the processed split CSVs, kept out of the load_data
+# stage's output directory
+SPLIT_CACHE_DIR = ".cache/splits"
+
+FEATURE_COLS = [
+    "MedInc",
+    "HouseAge",
+    "AveRooms",
+    "AveBedrms",
+    "Population",
+    "AveOccup",
+    "Latitude",
+    "Longitude",
+]
+TARGET_COL = "median_house_value"
+SPLIT_NAMES = ("train", "validation", "test")
+
 
+@lru_cache(maxsize=1)
 def load_config():
-    """Load configuration from config.yaml"""
+    """Load configuration from config.yaml (parsed once per process)"""
     config_path = Path(__file__).parent.parent.parent / "configs" / "config.yaml"
     with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=SafeLoader)
     return config
 
 
-def load_data():
+def _csv_signature(csv_path):
+    """Path, size and mtime of a CSV, stored in the metadata of its Parquet copy"""
+    stat = csv_path.stat()
+    return f"{csv_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+
+
+def _read_split(csv_path):
     """
-    Load training, validation, and test datasets
+    Read one processed split as float32, via a Parquet copy of the CSV
 
-    Returns:
-        tuple: (X_train, X_val, X_test, y_train, y_val, y_test)
+    The first read parses the CSV and writes ``<split>.parquet`` under
+    SPLIT_CACHE_DIR, tagged with the CSV's path, size and mtime. Later reads
+    load the columnar copy only while the tag still matches exactly, so a CSV
+    that is regenerated or restored with an older mtime is parsed again.
     """
+    signature = _csv_signature(csv_path)
+    parquet_path = Path(SPLIT_CACHE_DIR) / f"{csv_path.stem}.parquet"
+    if parquet_path.exists():
+        metadata = pq.read_schema(parquet_path).metadata or {}
+        if metadata.get(b"source_csv") == signature:
+            return pd.read_parquet(parquet_path, engine="pyarrow")
+
+    # Decode straight to float32 with pyarrow's multithreaded reader
+    table = pacsv.read_csv(
+        str(csv_path),
+        read_options=pacsv.ReadOptions(use_threads=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types={col: pa.float32() for col in FEATURE_COLS + [TARGET_COL]}
+        ),
+    )
+
+    # Written under a temporary name and renamed, so an interrupted write
+    # never leaves a truncated copy behind
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = parquet_path.with_suffix(".parquet.tmp")
+    pq.write_table(table.replace_schema_metadata({"source_csv": signature}), tmp_path)
+    os.replace(tmp_path, parquet_path)
+
+    # The Arrow buffers are released column by column while building the frame
+    return table.to_pandas(self_destruct=True)
+
+
+@lru_cache(maxsize=1)
+def _load_splits():
+    """Load the train/validation/test DataFrames once per process"""
     config = load_config()
     processed_path = Path(config["data"]["processed_data_path"])
+    return tuple(_read_split(processed_path / f"{name}.csv") for name in SPLIT_NAMES)
 
-    # Load datasets
-    train_data = pd.read_csv(processed_path / "train.csv")
-    val_data = pd.read_csv(processed_path / "validation.csv")
-    test_data = pd.read_csv(processed_path / "test.csv")
 
-    # Separate features and targets
-    feature_columns = [col for col in train_data.columns if col != "median_house_value"]
+@lru_cache(maxsize=1)
+def load_feature_names():
+    """Feature column names of the processed datasets, in column order"""
+    train_data = _load_splits()[0]
+    return [col for col in train_data.columns if col != TARGET_COL]
 
-    X_train = train_data[feature_columns]
-    y_train = train_data["median_house_value"]
 
-    X_val = val_data[feature_columns]
-    y_val = val_data["median_house_value"]
+def load_data():
+    """
+    Load training, validation, and test datasets
+
+    Returns:
+        tuple: (X_train, X_val, X_test, y_train, y_val, y_test) as float32
+            NumPy arrays; the feature names come from load_feature_names()
+    """
+    feature_columns = load_feature_names()
 
-    X_test = test_data[feature_columns]
-    y_test = test_data["median_house_value"]
+    # Separate features and targets
+    X_train, X_val, X_test = (
+        data[feature_columns].to_numpy(dtype=np.float32, copy=False)
+        for data in _load_splits()
+    )
+    y_train, y_val, y_test = (
+        data[TARGET_COL].to_numpy(dtype=np.float32, copy=False)
+        for data in _load_splits()
+    )
 
     logger.info(f"Training data shape: {X_train.shape}")
     logger.info(f"Validation data shape: {X_val.shape}")
@@ -75,70 +182,77 @@ def load_data():
     return X_train, X_val, X_test, y_train, y_val, y_test
 
 
-def start_mlflow_server():
-    """Start MLflow server in background"""
-
-    def run_server():
-        try:
-            # Change to project root directory
-            os.chdir(Path(__file__).parent.parent.parent)
-
-            # Start MLflow server
-            subprocess.run(
-                [
-                    "mlflow",
-                    "server",
-                    "--host",
-                    "0.0.0.0",
-                    "--port",
-                    "5000",
-                    "--backend-store-uri",
-                    "sqlite:///mlruns.db",
-                    "--default-artifact-root",
-                    "./mlruns",
-                ],
-                check=True,
-            )
-        except Exception as e:
-            logger.error(f"Failed to start MLflow server: {e}")
+def _sklearn_cache_location():
+    """
+    Cache directory for the installed scikit-learn version
+
+    Fitted estimators are pickled, and a pickle is only safe to load with the
+    scikit-learn version that wrote it, so each version gets its own directory.
+    """
+    return Path(SKLEARN_CACHE_DIR) / f"sklearn-{sklearn.__version__}"
 
-    # Start server in background thread
-    server_thread = threading.Thread(target=run_server, daemon=True)
-    server_thread.start()
 
-    # Wait for server to start
-    logger.info("Starting MLflow server...")
-    for i in range(30):  # Wait up to 30 seconds
-        try:
-            response = requests.get("http://localhost:5000/health")
-            if response.status_code == 200:
-                logger.info("MLflow server started successfully!")
-                return True
-        except:
-            pass
-        time.sleep(1)
+def _sklearn_memory():
+    """joblib Memory over this version's SKLEARN_CACHE_DIR (created on first use)"""
+    return Memory(_sklearn_cache_location(), verbose=0)
 
-    logger.warning("MLflow server may not have started properly")
-    return False
+
+def prune_sklearn_cache():
+    """Drop other scikit-learn versions' caches and trim this one to its limit"""
+    location = _sklearn_cache_location()
+    cache_dir = Path(SKLEARN_CACHE_DIR)
+    if cache_dir.is_dir():
+        for path in cache_dir.iterdir():
+            if path == location:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+    _sklearn_memory().reduce_size(bytes_limit=SKLEARN_CACHE_BYTES_LIMIT)
+
+
+def _fit(estimator, X, y):
+    """Fit and return the estimator (the function memoised by fit_cached)"""
+    return estimator.fit(X, y)
+
+
+def fit_cached(estimator, X, y):
+    """
+    Fit an estimator, or load the fitted copy from an earlier run
+
+    joblib hashes the unfitted estimator's parameters together with the
+    contents of X and y. Use the returned estimator, not the one passed in.
+    """
+    return _sklearn_memory().cache(_fit)(estimator, X, y)
+
+
+def memmap_array(array, path):
+    """
+    Save an array to a .npy file and reopen it as a read-only memory map
+
+    joblib's loky workers receive a memmapped array as a reference to its
+    file instead of a pickled copy of the data.
+    """
+    np.save(path, array)
+    return np.load(path, mmap_mode="r")
+
+
+def get_tracking_uri():
+    """MLFLOW_TRACKING_URI if set, otherwise the local ./mlruns file store"""
+    return (
+        os.environ.get("MLFLOW_TRACKING_URI") or Path.cwd().joinpath("mlruns").as_uri()
+    )
 
 
 def setup_mlflow():
     """Setup MLflow tracking"""
     config = load_config()
 
-    # Try to connect to existing server, if not start one
-    try:
-        response = requests.get("http://localhost:5000/health", timeout=2)
-        if response.status_code == 200:
-            logger.info("MLflow server already running")
-        else:
-            start_mlflow_server()
-    except:
-        logger.info("MLflow server not running, starting...")
-        start_mlflow_server()
-
-    # Set tracking URI
-    mlflow.set_tracking_uri("http://localhost:5000")
+    # Log straight to the file store: no server to start or poll, and no HTTP
+    # round trip per logged value. A remote server is still used when
+    # MLFLOW_TRACKING_URI points at one.
+    mlflow.set_tracking_uri(get_tracking_uri())
 
     # Set or create experiment
     experiment_name = config["mlflow"]["experiment_name"]
@@ -165,6 +279,26 @@ def setup_mlflow():
     return experiment_id
 
 
+def serve_mlflow_ui(tracking_uri):
+    """Serve the MLflow UI over a tracking store (blocks until interrupted)"""
+    logger.info(f"Serving MLflow UI for {tracking_uri} at http://localhost:5000")
+    subprocess.run(
+        ["mlflow", "ui", "--backend-store-uri", tracking_uri, "--port", "5000"],
+        check=True,
+    )
+
+
+def regression_metrics(y_true, y_pred):
+    """
+    RMSE, MAE and R² of a set of predictions
+
+    Returns:
+        tuple: (rmse, mae, r2) as floats
+    """
+    metrics = calculate_regression_metrics(y_true, y_pred)
+    return metrics["rmse"], metrics["mae"], metrics["r2_score"]
+
+
 def evaluate_model(model, X_val, y_val, X_test=None, y_test=None):
     """
     Evaluate model performance
@@ -183,18 +317,14 @@ def evaluate_model(model, X_val, y_val, X_test=None, y_test=None):
     y_val_pred = model.predict(X_val)
 
     # Calculate validation metrics
-    val_rmse = np.sqrt(mean_squared_error(y_val, y_val_pred))
-    val_mae = mean_absolute_error(y_val, y_val_pred)
-    val_r2 = r2_score(y_val, y_val_pred)
+    val_rmse, val_mae, val_r2 = regression_metrics(y_val, y_val_pred)
 
     metrics = {"val_rmse": val_rmse, "val_mae": val_mae, "val_r2": val_r2}
 
     # Test predictions if test data provided
     if X_test is not None and y_test is not None:
         y_test_pred = model.predict(X_test)
-        test_rmse = np.sqrt(mean_squared_error(y_test, y_test_pred))
-        test_mae = mean_absolute_error(y_test, y_test_pred)
-        test_r2 = r2_score(y_test, y_test_pred)
+        test_rmse, test_mae, test_r2 = regression_metrics(y_test, y_test_pred)
 
         metrics.update(
             {"test_rmse": test_rmse, "test_mae": test_mae, "test_r2": test_r2}
@@ -203,55 +333,67 @@ def evaluate_model(model, X_val, y_val, X_test=None, y_test=None):
     return metrics
 
 
-def create_feature_importance_plot(model, feature_names, model_name):
-    """Create feature importance plot for tree-based models"""
-    if hasattr(model, "feature_importances_"):
-        # Get feature importances
-        importances = model.feature_importances_
-        indices = np.argsort(importances)[::-1]
-
-        # Create plot
-        plt.figure(figsize=(10, 6))
-        plt.title(f"Feature Importance - {model_name}")
-        plt.bar(range(len(importances)), importances[indices])
-        plt.xticks(
-            range(len(importances)), [feature_names[i] for i in indices], rotation=45
-        )
-        plt.tight_layout()
+def log_feature_importance(model, feature_names):
+    """
+    Log a tree model's feature importances to the active MLflow run
 
-        # Save plot
-        plot_path = f"feature_importance_{model_name.lower().replace(' ', '_')}.png"
-        plt.savefig(plot_path)
-        plt.close()
+    The values go in as a table artifact (feature_importance.json), sorted
+    most important first; plots are left to whoever reads the run.
+    """
+    if not hasattr(model, "feature_importances_"):
+        return
 
-        return plot_path
-    return None
+    importance = pd.DataFrame(
+        {"feature": feature_names, "importance": model.feature_importances_}
+    )
+    mlflow.log_table(
+        importance.sort_values("importance", ascending=False),
+        "feature_importance.json",
+    )
 
 
-def train_linear_regression(X_train, y_train, X_val, y_val, X_test, y_test):
+def train_linear_regression(
+    X_train, y_train, X_val, y_val, X_test, y_test, feature_names, n_jobs=-1, cv=5
+):
     """Train Linear Regression model with hyperparameter tuning"""
     logger.info("Training Linear Regression model...")
 
     with mlflow.start_run(run_name="Linear_Regression"):
         # Define parameter grid
-        param_grid = {"regressor__fit_intercept": [True, False]}
+        param_grid = {"fit_intercept": [True, False]}
 
-        # Create pipeline with scaling
-        pipeline = Pipeline(
-            [("scaler", StandardScaler()), ("regressor", LinearRegression())]
-        )
+        # Scale once up front: the scaler has nothing to tune, so refitting it
+        # inside every CV fold would only repeat the same pass over X_train
+        scaler = StandardScaler().fit(X_train)
+        X_train_scaled = scaler.transform(X_train)
 
         # Grid search
         grid_search = GridSearchCV(
-            pipeline, param_grid, cv=5, scoring="neg_mean_squared_error", n_jobs=-1
+            LinearRegression(),
+            param_grid,
+            cv=cv,
+            scoring="neg_mean_squared_error",
+            n_jobs=n_jobs,
+            pre_dispatch="2*n_jobs",
+            refit=False,
         )
 
         # Fit model
-        grid_search.fit(X_train, y_train)
-        best_model = grid_search.best_estimator_
+        grid_search = fit_cached(grid_search, X_train_scaled, y_train)
 
-        # Log parameters
-        mlflow.log_params(grid_search.best_params_)
+        # The search is not refitted (refit=False), so the cached search holds
+        # only CV results; the full-data fit of the winner is cached on its own
+        regressor = fit_cached(
+            LinearRegression(**grid_search.best_params_), X_train_scaled, y_train
+        )
+
+        # Wrap with the scaler so the logged model takes unscaled features
+        best_model = Pipeline([("scaler", scaler), ("regressor", regressor)])
+
+        # Log parameters (named as the pipeline's regressor step)
+        mlflow.log_param(
+            "regressor__fit_intercept", grid_search.best_params_["fit_intercept"]
+        )
         mlflow.log_param("model_type", "Linear Regression")
 
         # Evaluate model
@@ -268,28 +410,36 @@ def train_linear_regression(X_train, y_train, X_val, y_val, X_test, y_test):
         return best_model, metrics
 
 
-def train_ridge_regression(X_train, y_train, X_val, y_val, X_test, y_test):
+def train_ridge_regression(
+    X_train, y_train, X_val, y_val, X_test, y_test, feature_names, n_jobs=-1, cv=5
+):
     """Train Ridge Regression model with hyperparameter tuning"""
     logger.info("Training Ridge Regression model...")
 
     with mlflow.start_run(run_name="Ridge_Regression"):
-        # Define parameter grid
-        param_grid = {"regressor__alpha": [0.1, 1.0, 10.0, 100.0, 1000.0]}
-
-        # Create pipeline with scaling
-        pipeline = Pipeline([("scaler", StandardScaler()), ("regressor", Ridge())])
-
-        # Grid search
-        grid_search = GridSearchCV(
-            pipeline, param_grid, cv=5, scoring="neg_mean_squared_error", n_jobs=-1
+        # RidgeCV scores every alpha by leave-one-out from a single SVD of the
+        # training data, instead of refitting Ridge per alpha and fold; the
+        # solve is cheap enough that n_jobs is not needed; cv and
+        # feature_names are accepted only to match the other trainers
+        best_model = Pipeline(
+            [
+                ("scaler", StandardScaler()),
+                (
+                    "regressor",
+                    RidgeCV(
+                        alphas=[0.1, 1.0, 10.0, 100.0, 1000.0],
+                        gcv_mode="svd",
+                        scoring="neg_mean_squared_error",
+                    ),
+                ),
+            ]
         )
 
         # Fit model
-        grid_search.fit(X_train, y_train)
-        best_model = grid_search.best_estimator_
+        best_model = fit_cached(best_model, X_train, y_train)
 
         # Log parameters
-        mlflow.log_params(grid_search.best_params_)
+        mlflow.log_param("regressor__alpha", best_model.named_steps["regressor"].alpha_)
         mlflow.log_param("model_type", "Ridge Regression")
 
         # Evaluate model
@@ -306,51 +456,83 @@ def train_ridge_regression(X_train, y_train, X_val, y_val, X_test, y_test):
         return best_model, metrics
 
 
-def train_random_forest(X_train, y_train, X_val, y_val, X_test, y_test):
+def tune_random_forest(X_train, y_train, cv=3, n_trials=RF_OPTUNA_TRIALS, n_jobs=-1):
+    """
+    Search Random Forest hyperparameters with Optuna's TPE sampler
+
+    Each trial runs K-fold CV and reports the running mean MSE after every
+    fold, so the median pruner can stop trials that are clearly behind
+    before all folds are fitted.
+
+    Returns:
+        dict: Best parameters found
+    """
+    # cv is a fold count or precomputed (train, test) index pairs
+    folds = list(check_cv(cv).split(X_train))
+
+    # sklearn's config is per thread and Optuna's trial threads start from
+    # the defaults, so hand each trial the caller's settings
+    sklearn_config = get_config()
+
+    def objective(trial):
+        params = {
+            "n_estimators": trial.suggest_int("n_estimators", 50, 300, step=50),
+            "max_depth": trial.suggest_categorical("max_depth", [10, 20, 30, None]),
+            "min_samples_split": trial.suggest_int("min_samples_split", 2, 10),
+            "min_samples_leaf": trial.suggest_int("min_samples_leaf", 1, 4),
+        }
+        # Trials run in parallel threads, so each forest builds on one core
+        rf = RandomForestRegressor(random_state=42, n_jobs=1, **params)
+
+        fold_mse = []
+        for fold, (train_idx, test_idx) in enumerate(folds):
+            with config_context(**sklearn_config):
+                rf.fit(X_train[train_idx], y_train[train_idx])
+                residuals = y_train[test_idx] - rf.predict(X_train[test_idx])
+            fold_mse.append(np.mean(residuals**2))
+
+            trial.report(np.mean(fold_mse), step=fold)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+
+        return np.mean(fold_mse)
+
+    study = optuna.create_study(
+        direction="minimize",
+        sampler=optuna.samplers.TPESampler(seed=42),
+        pruner=optuna.pruners.MedianPruner(n_warmup_steps=1),
+    )
+    study.optimize(objective, n_trials=n_trials, n_jobs=n_jobs)
+    return study.best_params
+
+
+def train_random_forest(
+    X_train, y_train, X_val, y_val, X_test, y_test, feature_names, n_jobs=-1, cv=3
+):
     """Train Random Forest model with hyperparameter tuning"""
     logger.info("Training Random Forest model...")
 
     with mlflow.start_run(run_name="Random_Forest"):
-        # Define parameter grid
-        param_grid = {
-            "n_estimators": [50, 100, 200],
-            "max_depth": [10, 20, 30, None],
-            "min_samples_split": [2, 5, 10],
-            "min_samples_leaf": [1, 2, 4],
-        }
-
-        # Create model
-        rf = RandomForestRegressor(random_state=42, n_jobs=-1)
-
-        # Grid search
-        grid_search = GridSearchCV(
-            rf,
-            param_grid,
-            cv=3,  # Reduced CV for faster training
-            scoring="neg_mean_squared_error",
-            n_jobs=-1,
+        # Search hyperparameters, then fit the best configuration
+        best_params = _sklearn_memory().cache(tune_random_forest)(
+            X_train, y_train, cv=cv, n_jobs=n_jobs
+        )
+        best_model = fit_cached(
+            RandomForestRegressor(random_state=42, n_jobs=n_jobs, **best_params),
+            X_train,
+            y_train,
         )
-
-        # Fit model
-        grid_search.fit(X_train, y_train)
-        best_model = grid_search.best_estimator_
 
         # Log parameters
-        mlflow.log_params(grid_search.best_params_)
+        mlflow.log_params(best_params)
         mlflow.log_param("model_type", "Random Forest")
 
         # Evaluate model
         metrics = evaluate_model(best_model, X_val, y_val, X_test, y_test)
         mlflow.log_metrics(metrics)
 
-        # Create and log feature importance plot
-        feature_names = X_train.columns.tolist()
-        plot_path = create_feature_importance_plot(
-            best_model, feature_names, "Random Forest"
-        )
-        if plot_path:
-            mlflow.log_artifact(plot_path)
-            os.remove(plot_path)  # Clean up
+        # Log feature importances
+        log_feature_importance(best_model, feature_names)
 
         # Log model
         mlflow.sklearn.log_model(best_model, "model")
@@ -362,13 +544,15 @@ def train_random_forest(X_train, y_train, X_val, y_val, X_test, y_test):
         return best_model, metrics
 
 
-def train_decision_tree(X_train, y_train, X_val, y_val, X_test, y_test):
+def train_decision_tree(
+    X_train, y_train, X_val, y_val, X_test, y_test, feature_names, n_jobs=-1, cv=5
+):
     """Train Decision Tree model with hyperparameter tuning"""
     logger.info("Training Decision Tree model...")
 
     with mlflow.start_run(run_name="Decision_Tree"):
-        # Define parameter grid
-        param_grid = {
+        # Define parameter distributions
+        param_distributions = {
             "max_depth": [5, 10, 15, 20, None],
             "min_samples_split": [2, 5, 10, 20],
             "min_samples_leaf": [1, 2, 5, 10],
@@ -377,14 +561,27 @@ def train_decision_tree(X_train, y_train, X_val, y_val, X_test, y_test):
         # Create model
         dt = DecisionTreeRegressor(random_state=42)
 
-        # Grid search
-        grid_search = GridSearchCV(
-            dt, param_grid, cv=5, scoring="neg_mean_squared_error", n_jobs=-1
+        # Successive halving: many candidates on a few samples, then the best
+        # third on three times as many, instead of all 80 on the full data
+        grid_search = HalvingRandomSearchCV(
+            dt,
+            param_distributions,
+            n_candidates=HALVING_CANDIDATES,
+            resource="n_samples",
+            min_resources="exhaust",
+            factor=3,
+            cv=cv,
+            scoring="neg_mean_squared_error",
+            n_jobs=n_jobs,
+            random_state=42,
+            refit=False,
         )
 
-        # Fit model
-        grid_search.fit(X_train, y_train)
-        best_model = grid_search.best_estimator_
+        # Fit model: search, then one full-data fit of the best parameters
+        grid_search = fit_cached(grid_search, X_train, y_train)
+        best_model = fit_cached(
+            clone(dt).set_params(**grid_search.best_params_), X_train, y_train
+        )
 
         # Log parameters
         mlflow.log_params(grid_search.best_params_)
@@ -394,14 +591,8 @@ def train_decision_tree(X_train, y_train, X_val, y_val, X_test, y_test):
         metrics = evaluate_model(best_model, X_val, y_val, X_test, y_test)
         mlflow.log_metrics(metrics)
 
-        # Create and log feature importance plot
-        feature_names = X_train.columns.tolist()
-        plot_path = create_feature_importance_plot(
-            best_model, feature_names, "Decision Tree"
-        )
-        if plot_path:
-            mlflow.log_artifact(plot_path)
-            os.remove(plot_path)  # Clean up
+        # Log feature importances
+        log_feature_importance(best_model, feature_names)
 
         # Log model
         mlflow.sklearn.log_model(best_model, "model")
@@ -413,6 +604,42 @@ def train_decision_tree(X_train, y_train, X_val, y_val, X_test, y_test):
         return best_model, metrics
 
 
+MODEL_TRAINERS = [
+    ("Linear Regression", train_linear_regression),
+    ("Ridge Regression", train_ridge_regression),
+    ("Random Forest", train_random_forest),
+    ("Decision Tree", train_decision_tree),
+]
+
+
+def _train_in_worker(
+    name, train_fn, tracking_uri, experiment_id, n_jobs, cv, data, feature_names
+):
+    """
+    Run one trainer in a joblib worker process
+
+    The worker starts without the parent's MLflow state, so the tracking URI
+    and experiment are set again before the trainer opens its run. The
+    processed splits are known to be free of NaN/inf, so sklearn's
+    finiteness scan of the inputs on every fit is switched off.
+
+    When this file runs as a script, the trainers reach the worker pickled by
+    value from ``__main__``, where lru_cached helpers such as
+    load_feature_names cannot be resolved. Everything they need is passed in.
+
+    Returns:
+        tuple or None: (model, metrics), or None if training failed
+    """
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_experiment(experiment_id=experiment_id)
+    try:
+        with config_context(assume_finite=True):
+            return train_fn(*data, feature_names, n_jobs=n_jobs, cv=cv)
+    except Exception as e:
+        logger.error(f"Failed to train {name}: {e}")
+        return None
+
+
 def compare_models(results):
     """Compare model results and select the best one"""
     logger.info("\n" + "=" * 50)
@@ -469,36 +696,35 @@ def register_best_model(best_model, best_name, best_score):
         logger.error(f"Failed to register model: {e}")
 
 
+def _np_default(o):
+    """json.dumps fallback that turns NumPy scalars and arrays into plain values"""
+    if isinstance(o, np.generic):
+        return o.item()
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
 def save_metrics_to_file(results, best_name, best_score):
     """Save metrics to JSON file for DVC tracking"""
     try:
-        # Prepare metrics for JSON serialization
-        metrics_data = {}
-        
-        # Add best model info
-        metrics_data["best_model"] = {
-            "name": best_name,
-            "val_rmse": float(best_score)
+        # Best model info plus every model's metrics; NumPy values are
+        # converted by the encoder's default hook as they are written
+        metrics_data = {
+            "best_model": {"name": best_name, "val_rmse": best_score},
+            **{
+                model_name.lower().replace(" ", "_"): metrics
+                for model_name, (_, metrics) in results.items()
+            },
         }
-        
-        # Add all model results
-        for model_name, (model, metrics) in results.items():
-            model_metrics = {}
-            for key, value in metrics.items():
-                # Convert numpy types to Python types for JSON serialization
-                if isinstance(value, (np.integer, np.floating, np.ndarray)):
-                    model_metrics[key] = float(value)
-                else:
-                    model_metrics[key] = value
-            
-            metrics_data[model_name.lower().replace(" ", "_")] = model_metrics
-        
+
         # Save to JSON file
-        with open("metrics.json", "w") as f:
-            json.dump(metrics_data, f, indent=2)
-        
+        Path("metrics.json").write_text(
+            json.dumps(metrics_data, indent=2, default=_np_default)
+        )
+
         logger.info("Metrics saved to metrics.json")
-        
+
     except Exception as e:
         logger.error(f"Failed to save metrics to file: {e}")
 
@@ -513,44 +739,38 @@ def main():
     # Load data
     X_train, X_val, X_test, y_train, y_val, y_test = load_data()
 
-    # Train models
-    results = {}
-
-    # Linear Regression
-    try:
-        model, metrics = train_linear_regression(
-            X_train, y_train, X_val, y_val, X_test, y_test
-        )
-        results["Linear Regression"] = (model, metrics)
-    except Exception as e:
-        logger.error(f"Failed to train Linear Regression: {e}")
-
-    # Ridge Regression
-    try:
-        model, metrics = train_ridge_regression(
-            X_train, y_train, X_val, y_val, X_test, y_test
-        )
-        results["Ridge Regression"] = (model, metrics)
-    except Exception as e:
-        logger.error(f"Failed to train Ridge Regression: {e}")
-
-    # Random Forest
-    try:
-        model, metrics = train_random_forest(
-            X_train, y_train, X_val, y_val, X_test, y_test
-        )
-        results["Random Forest"] = (model, metrics)
-    except Exception as e:
-        logger.error(f"Failed to train Random Forest: {e}")
-
-    # Decision Tree
-    try:
-        model, metrics = train_decision_tree(
-            X_train, y_train, X_val, y_val, X_test, y_test
+    # Train the models concurrently, one worker process each; the cores are
+    # split between the workers so the inner grid searches don't oversubscribe
+    tracking_uri = mlflow.get_tracking_uri()
+    n_jobs = max(1, (os.cpu_count() or 1) // len(MODEL_TRAINERS))
+    # One set of CV folds for all models, so they are scored on the same splits
+    cv = list(KFold(n_splits=5, shuffle=True, random_state=42).split(X_train))
+    with tempfile.TemporaryDirectory(prefix="train-model-") as mmap_dir:
+        # Share the training set with the model workers and their CV workers
+        # through one memmapped file each, rather than a pickled copy per task
+        X_train = memmap_array(X_train, Path(mmap_dir) / "X_train.npy")
+        y_train = memmap_array(y_train, Path(mmap_dir) / "y_train.npy")
+        data = (X_train, y_train, X_val, y_val, X_test, y_test)
+        feature_names = load_feature_names()
+        outcomes = Parallel(n_jobs=len(MODEL_TRAINERS), backend="loky")(
+            delayed(_train_in_worker)(
+                name,
+                train_fn,
+                tracking_uri,
+                experiment_id,
+                n_jobs,
+                cv,
+                data,
+                feature_names,
+            )
+            for name, train_fn in MODEL_TRAINERS
         )
-        results["Decision Tree"] = (model, metrics)
-    except Exception as e:
-        logger.error(f"Failed to train Decision Tree: {e}")
+    results = {
+        name: outcome
+        for (name, _), outcome in zip(MODEL_TRAINERS, outcomes)
+        if outcome is not None
+    }
+    prune_sklearn_cache()
 
     # Compare models and select best
     if results:
@@ -570,4 +790,15 @@ def main():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--serve-ui",
+        action="store_true",
+        help="serve the MLflow UI over the tracking store after training",
+    )
+    args = parser.parse_args()
+
     main()
+
+    if args.serve_ui:
+        serve_mlflow_ui(mlflow.get_tracking_uri())
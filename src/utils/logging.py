@@ -12,8 +12,9 @@ import uuid
 from datetime import datetime
 from functools import wraps
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+import orjson
 import psutil
 
 
@@ -91,30 +92,37 @@ class StructuredLogger:
 
         return json.dumps(log_data)
 
-    def info(self, message: str, **kwargs):
+    def isEnabledFor(self, level: int) -> bool:
+        """Whether a message at this level would be emitted"""
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level: int, message: str, args: tuple, kwargs: Dict[str, Any]):
+        """Format and emit a message, skipping all formatting if the level is off"""
+        if not self.logger.isEnabledFor(level):
+            return
+        if args:
+            message = message % args
+        self.logger.log(level, self._format_message(message, kwargs))
+
+    def info(self, message: str, *args, **kwargs):
         """Log info message"""
-        formatted_message = self._format_message(message, kwargs)
-        self.logger.info(formatted_message)
+        self._log(logging.INFO, message, args, kwargs)
 
-    def warning(self, message: str, **kwargs):
+    def warning(self, message: str, *args, **kwargs):
         """Log warning message"""
-        formatted_message = self._format_message(message, kwargs)
-        self.logger.warning(formatted_message)
+        self._log(logging.WARNING, message, args, kwargs)
 
-    def error(self, message: str, **kwargs):
+    def error(self, message: str, *args, **kwargs):
         """Log error message"""
-        formatted_message = self._format_message(message, kwargs)
-        self.logger.error(formatted_message)
+        self._log(logging.ERROR, message, args, kwargs)
 
-    def debug(self, message: str, **kwargs):
+    def debug(self, message: str, *args, **kwargs):
         """Log debug message"""
-        formatted_message = self._format_message(message, kwargs)
-        self.logger.debug(formatted_message)
+        self._log(logging.DEBUG, message, args, kwargs)
 
-    def critical(self, message: str, **kwargs):
+    def critical(self, message: str, *args, **kwargs):
         """Log critical message"""
-        formatted_message = self._format_message(message, kwargs)
-        self.logger.critical(formatted_message)
+        self._log(logging.CRITICAL, message, args, kwargs)
 
 
 class PerformanceLogger:
@@ -341,7 +349,7 @@ class DatabaseLogger:
                         prediction_id,
                         datetime.utcnow().isoformat() + "Z",
                         model_version,
-                        json.dumps(input_features),
+                        orjson.dumps(input_features).decode(),
                         prediction,
                         confidence,
                         processing_time_ms,
@@ -352,6 +360,52 @@ class DatabaseLogger:
         except Exception as e:
             print(f"Failed to log prediction to database: {e}")
 
+    def log_predictions_bulk(
+        self,
+        prediction_ids: List[str],
+        model_version: str,
+        feature_names: Sequence[str],
+        feature_rows: Sequence[Sequence[float]],
+        predictions: Sequence[float],
+        processing_time_ms: float = 0.0,
+        request_source: str = None,
+    ):
+        """Log a batch of predictions to database with a single executemany"""
+        import sqlite3
+
+        timestamp = datetime.utcnow().isoformat() + "Z"
+        rows = [
+            (
+                prediction_id,
+                timestamp,
+                model_version,
+                # orjson encodes the feature floats in C, once per row
+                orjson.dumps(dict(zip(feature_names, features))).decode(),
+                prediction,
+                None,
+                processing_time_ms,
+                request_source,
+            )
+            for prediction_id, features, prediction in zip(
+                prediction_ids, feature_rows, predictions
+            )
+        ]
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO predictions 
+                    (id, timestamp, model_version, input_features, prediction, 
+                     confidence, processing_time_ms, request_source)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    rows,
+                )
+                conn.commit()
+        except Exception as e:
+            print(f"Failed to log predictions to database: {e}")
+
     def log_metric(
         self, metric_name: str, metric_value: float, tags: Dict[str, Any] = None
     ):
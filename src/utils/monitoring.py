@@ -281,6 +281,101 @@ class MetricsCollector:
         except Exception as e:
             print(f"Failed to record API metrics: {e}")
 
+    def record_api_requests(self, requests: List[tuple]):
+        """Record a batch of (endpoint, method, status_code, response_time_ms) requests"""
+        if not requests:
+            return
+
+        timestamp = datetime.utcnow().isoformat() + "Z"
+        metric_rows = []
+
+        with self.lock:
+            for endpoint, method, status_code, response_time_ms in requests:
+                counter_tags = {
+                    "endpoint": endpoint,
+                    "method": method,
+                    "status": str(status_code),
+                }
+                counter_key = (
+                    f"api.requests.total:{json.dumps(counter_tags, sort_keys=True)}"
+                )
+                self.counters[counter_key] += 1
+
+                histogram_tags = {"endpoint": endpoint, "method": method}
+                histogram_key = (
+                    f"api.response_time_ms:{json.dumps(histogram_tags, sort_keys=True)}"
+                )
+                self.histograms[histogram_key].append(response_time_ms)
+                if len(self.histograms[histogram_key]) > 100:
+                    self.histograms[histogram_key] = self.histograms[histogram_key][
+                        -100:
+                    ]
+
+                for metric, metric_type in (
+                    (
+                        MetricPoint(
+                            timestamp=timestamp,
+                            name="api.requests.total",
+                            value=self.counters[counter_key],
+                            tags=counter_tags,
+                        ),
+                        "counter",
+                    ),
+                    (
+                        MetricPoint(
+                            timestamp=timestamp,
+                            name="api.response_time_ms",
+                            value=response_time_ms,
+                            tags=histogram_tags,
+                        ),
+                        "histogram",
+                    ),
+                ):
+                    self.metrics_buffer.append(metric)
+                    metric_rows.append(
+                        (
+                            metric.timestamp,
+                            metric.name,
+                            metric.value,
+                            json.dumps(metric.tags),
+                            metric_type,
+                        )
+                    )
+
+        # Store the whole batch in a single transaction
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO metrics (timestamp, name, value, tags, type)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    metric_rows,
+                )
+                conn.executemany(
+                    """
+                    INSERT INTO api_metrics 
+                    (timestamp, endpoint, method, status_code, response_time_ms,
+                     request_size_bytes, response_size_bytes)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    [
+                        (
+                            timestamp,
+                            endpoint,
+                            method,
+                            status_code,
+                            response_time_ms,
+                            None,
+                            None,
+                        )
+                        for endpoint, method, status_code, response_time_ms in requests
+                    ],
+                )
+                conn.commit()
+        except Exception as e:
+            print(f"Failed to record API metrics: {e}")
+
     def record_model_prediction(
         self,
         model_name: str,
@@ -343,6 +438,77 @@ class MetricsCollector:
         except Exception as e:
             print(f"Failed to record model metrics: {e}")
 
+    def record_model_predictions(
+        self,
+        model_name: str,
+        model_version: str,
+        prediction_values: List[float],
+        prediction_time_ms: float = 0.0,
+    ):
+        """Record metrics for a batch of model predictions in one pass"""
+        if not prediction_values:
+            return
+
+        timestamp = datetime.utcnow().isoformat() + "Z"
+        tags = {"model_name": model_name, "model_version": model_version}
+        count = len(prediction_values)
+
+        # One counter increment for the whole batch
+        self.record_counter("model.predictions.total", value=count, tags=tags)
+
+        with self.lock:
+            key_suffix = json.dumps(tags, sort_keys=True)
+            histogram_points = [
+                ("model.prediction_time_ms", prediction_time_ms) for _ in range(count)
+            ] + [("model.prediction_value", value) for value in prediction_values]
+
+            for name, value in histogram_points:
+                key = f"{name}:{key_suffix}"
+                self.histograms[key].append(value)
+                self.metrics_buffer.append(
+                    MetricPoint(timestamp=timestamp, name=name, value=value, tags=tags)
+                )
+            for name in ("model.prediction_time_ms", "model.prediction_value"):
+                key = f"{name}:{key_suffix}"
+                self.histograms[key] = self.histograms[key][-100:]
+
+        # Store histogram points and model_metrics rows in one transaction each
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO metrics (timestamp, name, value, tags, type)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    [
+                        (timestamp, name, value, json.dumps(tags), "histogram")
+                        for name, value in histogram_points
+                    ],
+                )
+                conn.executemany(
+                    """
+                    INSERT INTO model_metrics 
+                    (timestamp, model_name, model_version, prediction_time_ms,
+                     prediction_value, confidence_score, input_features)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    [
+                        (
+                            timestamp,
+                            model_name,
+                            model_version,
+                            prediction_time_ms,
+                            value,
+                            None,
+                            None,
+                        )
+                        for value in prediction_values
+                    ],
+                )
+                conn.commit()
+        except Exception as e:
+            print(f"Failed to record model metrics: {e}")
+
     def get_metrics_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get metrics summary for the last N hours"""
         cutoff_time = (datetime.utcnow() - timedelta(hours=hours)).isoformat() + "Z"
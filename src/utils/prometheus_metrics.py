@@ -194,6 +194,26 @@ class PrometheusMetrics:
             inference_time
         )
 
+    def record_model_predictions(
+        self,
+        model_name: str,
+        prediction_values,
+        inference_time: float,
+        prediction_type: str = "batch",
+    ):
+        """Record metrics for a batch of predictions produced by one model call"""
+        self.model_predictions_total.labels(
+            model_name=model_name, prediction_type=prediction_type
+        ).inc(len(prediction_values))
+
+        for prediction_value in prediction_values:
+            self.model_prediction_value.observe(prediction_value)
+
+        # A batch is a single inference call, so it is timed once
+        self.model_inference_duration.labels(model_name=model_name).observe(
+            inference_time
+        )
+
     def update_system_metrics(self):
         """Update system resource metrics"""
         # CPU usage
@@ -279,7 +299,7 @@ class PrometheusMetrics:
         except Exception as e:
             print(f"Error loading metrics from database: {e}")
 
-    def generate_metrics(self) -> str:
+    def generate_metrics(self) -> bytes:
         """Generate Prometheus metrics in text format"""
         # Update system metrics
         self.update_system_metrics()
@@ -299,8 +319,8 @@ class PrometheusMetrics:
 prometheus_metrics = PrometheusMetrics()
 
 
-def get_prometheus_metrics() -> str:
-    """Get Prometheus metrics as string"""
+def get_prometheus_metrics() -> bytes:
+    """Get Prometheus metrics as encoded text"""
     return prometheus_metrics.generate_metrics()
 
 
@@ -326,6 +346,15 @@ def record_prediction_metrics(
     )
 
 
+def record_batch_prediction_metrics(
+    model_name: str, prediction_values, inference_time: float
+):
+    """Record metrics for a batch prediction (to be called from batch endpoints)"""
+    prometheus_metrics.record_model_predictions(
+        model_name, prediction_values, inference_time
+    )
+
+
 def update_health_status(health_status: Dict[str, Any]):
     """Update health status metrics"""
     prometheus_metrics.update_health_metrics(health_status)
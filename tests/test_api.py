@@ -5,21 +5,50 @@ Tests for the Housing Price Prediction API
 import asyncio
 import json
 import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
+from pydantic import ValidationError
 
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from api.main import app
-from api.models import HousingFeatures, PredictionResponse
+from api.batching import MicroBatcher
+from api.main import ModelBundle, app
+from api.models import (
+    FEATURE_HIGH,
+    FEATURE_LOW,
+    FEATURE_NAMES,
+    BatchPredictionRequest,
+    HousingFeatures,
+    PredictionResponse,
+    batch_request_decoder,
+    batch_uuids,
+    create_prediction_response,
+    features_to_matrix,
+)
 
 # Create test client
 client = TestClient(app)
 
+
+def loaded_model(model=None, version="test_version"):
+    """Patch the API with a loaded model bundle (a Mock model by default)"""
+    if model is None:
+        model = MagicMock()
+    return patch.object(app.state, "bundle", ModelBundle(model=model, version=version))
+
+
+def no_model_loaded():
+    """Patch the API so that no model is loaded"""
+    return patch.object(app.state, "bundle", None)
+
 # Test data
 VALID_HOUSING_DATA = {
     "MedInc": 8.3252,
@@ -81,19 +110,18 @@ class TestHealthEndpoint:
 
     def test_health_endpoint_with_model_loaded(self):
         """Test health endpoint when model is loaded"""
-        with patch("api.main.model", Mock()):
-            with patch("api.main.model_version", "test_version"):
-                response = client.get("/health")
-                assert response.status_code == 200
+        with loaded_model():
+            response = client.get("/health")
+            assert response.status_code == 200
 
-                data = response.json()
-                assert data["status"] == "healthy"
-                assert data["model_loaded"] is True
-                assert data["model_version"] == "test_version"
+            data = response.json()
+            assert data["status"] == "healthy"
+            assert data["model_loaded"] is True
+            assert data["model_version"] == "test_version"
 
     def test_health_endpoint_without_model(self):
         """Test health endpoint when model is not loaded"""
-        with patch("api.main.model", None):
+        with no_model_loaded():
             response = client.get("/health")
             assert response.status_code == 200
 
@@ -105,14 +133,14 @@ class TestHealthEndpoint:
 class TestPredictionEndpoint:
     """Test the prediction endpoint"""
 
-    @patch("api.main.model")
-    def test_predict_success(self, mock_model):
+    def test_predict_success(self):
         """Test successful prediction"""
         # Mock model prediction
+        mock_model = MagicMock()
         mock_model.predict.return_value = [4.526]
         
-        # Also mock model_version and model_name to avoid AttributeError
-        with patch("api.main.model_version", "test_version"):
+        # Also mock model_name to avoid AttributeError
+        with loaded_model(mock_model):
             with patch("api.main.model_name", "TestModel"):
                 response = client.post("/predict", json=VALID_HOUSING_DATA)
                 
@@ -156,37 +184,72 @@ class TestPredictionEndpoint:
 
     def test_predict_model_not_loaded(self):
         """Test prediction when model is not loaded"""
-        with patch("api.main.model", None):
+        with no_model_loaded():
             response = client.post("/predict", json=VALID_HOUSING_DATA)
             assert response.status_code == 503
 
             data = response.json()
             assert "Model not loaded" in data["detail"]
 
-    @patch("api.main.model")
-    def test_predict_model_error(self, mock_model):
+    def test_predict_model_error(self):
         """Test prediction when model raises an error"""
+        mock_model = MagicMock()
         mock_model.predict.side_effect = Exception("Model error")
 
-        response = client.post("/predict", json=VALID_HOUSING_DATA)
+        with loaded_model(mock_model):
+            response = client.post("/predict", json=VALID_HOUSING_DATA)
         assert response.status_code == 500
 
         data = response.json()
         assert "Prediction failed" in data["detail"]
 
+    def test_predict_response_matches_schema(self):
+        """Test the unvalidated /predict response still satisfies its schema"""
+        mock_model = MagicMock()
+        mock_model.predict.return_value = np.array([4.526])
+
+        with loaded_model(mock_model):
+            response = client.post("/predict", json=VALID_HOUSING_DATA)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+
+        route = next(r for r in app.routes if getattr(r, "path", "") == "/predict")
+        data = response.json()
+        assert route.response_model.model_validate(data).model_dump() == data
+        assert data["prediction"] == 4.526
+        assert data["confidence_interval"] is None
+
+    def test_response_models_are_frozen(self):
+        """Test the served response schemas are closed and immutable"""
+        schemas = client.get("/openapi.json").json()["components"]["schemas"]
+        for name in ("PredictionResponse", "HealthResponse", "BatchPredictionResponse"):
+            assert schemas[name]["additionalProperties"] is False
+
+        # The model /predict actually serves, which is main.py's own schema
+        route = next(r for r in app.routes if getattr(r, "path", "") == "/predict")
+        response = route.response_model(
+            prediction=4.526,
+            prediction_id="test-id",
+            model_version="test_version",
+            timestamp="2025-07-28T12:00:00Z",
+            input_features=VALID_HOUSING_DATA,
+        )
+        with pytest.raises(ValidationError):
+            response.prediction = 1.0
+
 
 class TestBatchPredictionEndpoint:
     """Test the batch prediction endpoint"""
 
-    @patch("api.main.model")
-    def test_batch_predict_success(self, mock_model):
+    def test_batch_predict_success(self):
         """Test successful batch prediction"""
         # Mock model prediction
+        mock_model = MagicMock()
         mock_model.predict.return_value = [4.526, 3.875]
 
         batch_data = {"instances": [VALID_HOUSING_DATA, VALID_HOUSING_DATA]}
 
-        with patch("api.main.model_version", "test_version"):
+        with loaded_model(mock_model):
             with patch("api.main.model_name", "TestModel"):
                 response = client.post("/predict/batch", json=batch_data)
                 
@@ -218,6 +281,55 @@ class TestBatchPredictionEndpoint:
         response = client.post("/predict/batch", json=batch_data)
         assert response.status_code == 422
 
+    def test_batch_predict_invalid_instance(self):
+        """Test batch prediction rejects out-of-range and malformed instances"""
+        batch_data = {"instances": [VALID_HOUSING_DATA, INVALID_HOUSING_DATA]}
+
+        response = client.post("/predict/batch", json=batch_data)
+        assert response.status_code == 422
+        assert "instances[1].MedInc" in response.json()["detail"]
+
+        response = client.post(
+            "/predict/batch",
+            content=b'{"instances": [',
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 422
+
+    def test_batch_predict_accepts_what_predict_accepts(self):
+        """Test batch instances are validated by the same rules as /predict"""
+        mock_model = MagicMock()
+        mock_model.predict.return_value = np.array([4.526])
+
+        rows = [
+            # Unknown fields are ignored
+            dict(VALID_HOUSING_DATA, note="corner lot"),
+            # No cross-field checks
+            dict(VALID_HOUSING_DATA, Population=1.0, AveOccup=2.0),
+            dict(VALID_HOUSING_DATA, AveRooms=1.0, AveBedrms=2.0),
+        ]
+
+        with loaded_model(mock_model):
+            for row in rows:
+                assert client.post("/predict", json=row).status_code == 200
+                response = client.post("/predict/batch", json={"instances": [row]})
+                assert response.status_code == 200
+
+    def test_batch_request_schema_documents_enforced_rules(self):
+        """Test the documented batch body matches what the endpoint enforces"""
+        openapi = client.get("/openapi.json").json()
+        body = openapi["paths"]["/predict/batch"]["post"]["requestBody"]
+        schema = body["content"]["application/json"]["schema"]
+
+        assert schema["properties"]["instances"]["minItems"] == 1
+        assert schema["properties"]["instances"]["maxItems"] == 100
+        assert schema["properties"]["batch_name"]["anyOf"][0]["maxLength"] == 100
+
+        features = openapi["components"]["schemas"]["HousingFeatures"]
+        for name, low, high in zip(FEATURE_NAMES, FEATURE_LOW, FEATURE_HIGH):
+            assert features["properties"][name]["minimum"] == low
+            assert features["properties"][name]["maximum"] == high
+
     def test_batch_predict_too_many_instances(self):
         """Test batch prediction with too many instances"""
         batch_data = {"instances": [VALID_HOUSING_DATA] * 101}  # Exceeds limit of 100
@@ -225,28 +337,88 @@ class TestBatchPredictionEndpoint:
         response = client.post("/predict/batch", json=batch_data)
         assert response.status_code == 422
 
+    def test_batch_predict_request_too_large(self):
+        """Test oversized batch request bodies are rejected before validation"""
+        batch_data = {
+            "instances": [VALID_HOUSING_DATA],
+            "padding": "x" * 100_000,
+        }
+
+        response = client.post("/predict/batch", json=batch_data)
+        assert response.status_code == 413
+
     def test_batch_predict_model_not_loaded(self):
         """Test batch prediction when model is not loaded"""
-        with patch("api.main.model", None):
+        with no_model_loaded():
             batch_data = {"instances": [VALID_HOUSING_DATA]}
 
             response = client.post("/predict/batch", json=batch_data)
             assert response.status_code == 503
 
+    def test_batch_predict_prediction_ids_are_uuids(self):
+        """Test every prediction in a batch gets its own version 4 UUID"""
+        mock_model = MagicMock()
+        mock_model.predict.return_value = np.array([4.526, 3.875, 2.5])
+
+        batch_data = {"instances": [VALID_HOUSING_DATA] * 3}
+        with loaded_model(mock_model):
+            response = client.post("/predict/batch", json=batch_data)
+        assert response.status_code == 200
+
+        ids = [p["prediction_id"] for p in response.json()["predictions"]]
+        assert len(set(ids)) == 3
+        assert all(uuid.UUID(hex=i).version == 4 for i in ids)
+
+
+class TestResponseHelpers:
+    """Test the server-side response constructors in api.models"""
+
+    def test_create_prediction_response(self):
+        """Test prediction responses get a version 4 UUID in hex form"""
+        response = create_prediction_response(
+            prediction=4.526,
+            model_version="1",
+            input_features=VALID_HOUSING_DATA,
+        )
+        assert uuid.UUID(hex=response.prediction_id).hex == response.prediction_id
+        assert uuid.UUID(hex=response.prediction_id).version == 4
+        assert PredictionResponse.model_validate(response.model_dump()) == response
+
+
+class TestBatchUuids:
+    """Test the bulk UUID generator used for batch prediction ids"""
+
+    def test_version_and_variant_bits(self):
+        """Test each id is an RFC 4122 version 4 UUID in hex form"""
+        for value in batch_uuids(1000):
+            parsed = uuid.UUID(hex=value)
+            assert value == parsed.hex
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+
+    def test_unique(self):
+        """Test ids are unique within and across calls"""
+        first, second = batch_uuids(1000), batch_uuids(1000)
+        assert len(set(first) | set(second)) == 2000
+
+    def test_empty(self):
+        """Test a zero-length batch gets no ids"""
+        assert batch_uuids(0) == []
+
 
 class TestModelInfoEndpoint:
     """Test the model info endpoint"""
 
-    @patch("api.main.model")
-    @patch("api.main.model_version", "test_version")
     @patch("api.main.model_name", "TestModel")
-    def test_model_info_success(self, mock_model):
+    def test_model_info_success(self):
         """Test successful model info retrieval"""
         # Mock model with feature importances
+        mock_model = MagicMock()
         mock_model.feature_importances_ = [0.1, 0.2, 0.15, 0.05, 0.1, 0.05, 0.2, 0.15]
         mock_model.__class__.__name__ = "RandomForestRegressor"
 
-        response = client.get("/model/info")
+        with loaded_model(mock_model):
+            response = client.get("/model/info")
         assert response.status_code == 200
 
         data = response.json()
@@ -262,7 +434,7 @@ class TestModelInfoEndpoint:
 
     def test_model_info_model_not_loaded(self):
         """Test model info when model is not loaded"""
-        with patch("api.main.model", None):
+        with no_model_loaded():
             response = client.get("/model/info")
             assert response.status_code == 503
 
@@ -273,9 +445,11 @@ class TestModelReloadEndpoint:
     @patch("api.main.load_model")
     def test_model_reload_success(self, mock_load_model):
         """Test successful model reload"""
-        mock_load_model.return_value = True
+        mock_load_model.return_value = ModelBundle(
+            model=MagicMock(), version="new_version"
+        )
 
-        with patch("api.main.model_version", "new_version"):
+        with loaded_model(version="old_version"):
             response = client.post("/model/reload")
             assert response.status_code == 200
 
@@ -284,11 +458,13 @@ class TestModelReloadEndpoint:
             assert "model_version" in data
             assert "timestamp" in data
             assert "reloaded successfully" in data["message"]
+            assert data["model_version"] == "new_version"
+            assert app.state.bundle is mock_load_model.return_value
 
     @patch("api.main.load_model")
     def test_model_reload_failure(self, mock_load_model):
         """Test failed model reload"""
-        mock_load_model.return_value = False
+        mock_load_model.return_value = None
 
         response = client.post("/model/reload")
         assert response.status_code == 500
@@ -307,6 +483,37 @@ class TestInputValidation:
         with pytest.raises(ValueError):
             HousingFeatures(**INVALID_HOUSING_DATA)
 
+    def test_housing_features_cross_field_validation(self):
+        """Test rooms/bedrooms and occupancy/population consistency checks"""
+        fewer_rooms_data = VALID_HOUSING_DATA.copy()
+        fewer_rooms_data["AveRooms"] = 1.0
+        fewer_rooms_data["AveBedrms"] = 2.0
+        with pytest.raises(ValueError):
+            HousingFeatures(**fewer_rooms_data)
+
+        crowded_data = VALID_HOUSING_DATA.copy()
+        crowded_data["Population"] = 1.0
+        crowded_data["AveOccup"] = 2.0
+        with pytest.raises(ValueError):
+            HousingFeatures(**crowded_data)
+
+        # Numeric strings are still coerced by the float fields
+        string_data = VALID_HOUSING_DATA.copy()
+        string_data["MedInc"] = "8.3252"
+        assert HousingFeatures(**string_data).MedInc == 8.3252
+
+    def test_batch_request_to_matrix(self):
+        """Test batch requests build a feature matrix in FEATURE_NAMES order"""
+        expected = [[VALID_HOUSING_DATA[name] for name in FEATURE_NAMES]] * 2
+        batch_data = {"instances": [VALID_HOUSING_DATA, VALID_HOUSING_DATA]}
+
+        matrix = features_to_matrix(BatchPredictionRequest(**batch_data).instances)
+        assert matrix.shape == (2, len(FEATURE_NAMES))
+        assert matrix.tolist() == expected
+
+        fast_request = batch_request_decoder.decode(json.dumps(batch_data))
+        assert features_to_matrix(fast_request.instances).tolist() == expected
+
     def test_latitude_longitude_bounds(self):
         """Test latitude and longitude bounds validation"""
         # Invalid latitude (too high)
@@ -356,18 +563,108 @@ class TestCORS:
         assert response.status_code in [200, 405]  # Depending on FastAPI version
 
 
+class TestMicroBatcher:
+    """Test coalescing of concurrent single predictions"""
+
+    def test_concurrent_predictions_share_model_calls(self):
+        """Test concurrent rows are fused into batched predict calls"""
+        mock_model = Mock()
+        mock_model.predict.side_effect = lambda X: X[:, 0] * 2
+
+        async def run():
+            batcher = MicroBatcher(window_ms=5, max_batch_size=8)
+            batcher.start()
+            try:
+                rows = [np.full(8, float(i)) for i in range(20)]
+                return await asyncio.gather(
+                    *(batcher.predict(mock_model, row) for row in rows)
+                )
+            finally:
+                await batcher.stop()
+
+        results = asyncio.run(run())
+
+        assert [float(r) for r in results] == [2.0 * i for i in range(20)]
+        assert mock_model.predict.call_count < 20
+        assert all(len(call.args[0]) <= 8 for call in mock_model.predict.call_args_list)
+
+    def test_model_errors_reach_every_caller(self):
+        """Test a failing predict call fails every request in the batch"""
+        mock_model = Mock()
+        mock_model.predict.side_effect = RuntimeError("model failure")
+
+        async def run():
+            batcher = MicroBatcher(window_ms=5)
+            batcher.start()
+            try:
+                return await asyncio.gather(
+                    *(batcher.predict(mock_model, np.zeros(8)) for _ in range(3)),
+                    return_exceptions=True,
+                )
+            finally:
+                await batcher.stop()
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_stop_cancels_requests_in_open_window(self):
+        """Test stop() cancels requests already collected into a batch"""
+        mock_model = Mock()
+        mock_model.predict.side_effect = lambda X: X[:, 0]
+
+        async def run():
+            batcher = MicroBatcher(window_ms=10_000, max_batch_size=8)
+            batcher.start()
+            pending = asyncio.ensure_future(batcher.predict(mock_model, np.zeros(8)))
+            # Let the batching task take the request off the queue
+            await asyncio.sleep(0.05)
+            assert batcher._queue.empty()
+
+            await batcher.stop()
+            # Would hang without the cancellation; bounded so the test can't
+            return await asyncio.wait_for(
+                asyncio.gather(pending, return_exceptions=True), timeout=1
+            )
+
+        results = asyncio.run(run())
+
+        assert isinstance(results[0], asyncio.CancelledError)
+        mock_model.predict.assert_not_called()
+
+    def test_unstarted_batcher_predicts_on_executor(self):
+        """Test the fallback for an unstarted batcher keeps predict off the loop"""
+        loop_thread = threading.get_ident()
+        predict_threads = []
+
+        def predict(X):
+            predict_threads.append(threading.get_ident())
+            return X[:, 0] * 2
+
+        mock_model = Mock()
+        mock_model.predict.side_effect = predict
+
+        async def run():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                batcher = MicroBatcher(executor=executor)
+                return await batcher.predict(mock_model, np.full(8, 1.5))
+
+        assert asyncio.run(run()) == 3.0
+        assert predict_threads and predict_threads[0] != loop_thread
+
+
 # Integration tests
 class TestIntegration:
     """Integration tests"""
 
-    @patch("api.main.model")
-    def test_full_prediction_workflow(self, mock_model):
+    def test_full_prediction_workflow(self):
         """Test complete prediction workflow"""
+        mock_model = MagicMock()
         mock_model.predict.return_value = [4.526]
         mock_model.feature_importances_ = [0.1, 0.2, 0.15, 0.05, 0.1, 0.05, 0.2, 0.15]
         mock_model.__class__.__name__ = "RandomForestRegressor"
 
-        with patch("api.main.model_version", "test_version"):
+        with loaded_model(mock_model):
             with patch("api.main.model_name", "TestModel"):
                 # 1. Check health
                 health_response = client.get("/health")
@@ -0,0 +1,64 @@
+"""
+Smoke test for the opt-in Cython build of api.models
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Imported from the compiled extension; exercises every schema class
+IMPORT_CHECK = """
+import json
+from importlib.machinery import EXTENSION_SUFFIXES
+
+import api.models as m
+
+assert m.__file__.endswith(tuple(EXTENSION_SUFFIXES)), m.__file__
+
+row = dict(zip(m.FEATURE_NAMES, [8.3252, 41.0, 6.98, 1.02, 322.0, 2.55, 37.88, -122.23]))
+request = m.BatchPredictionRequest(instances=[row, row])
+fast_request = m.batch_request_decoder.decode(json.dumps({"instances": [row]}))
+matrix = m.features_to_matrix(fast_request.instances)
+fast_request.validate_bounds_vectorized(matrix)
+assert m.features_to_matrix(request.instances).shape == (2, 8)
+m.BatchPredictionRequest.model_json_schema()
+"""
+
+
+@pytest.mark.slow
+def test_compiled_models_module_imports(tmp_path):
+    """Build api.models with HOUSING_CYTHONIZE=1 and use the compiled module"""
+    pytest.importorskip("Cython")
+
+    for name in ("setup.py", "README.md", "requirements.txt"):
+        shutil.copy(PROJECT_ROOT / name, tmp_path / name)
+    shutil.copytree(
+        PROJECT_ROOT / "src",
+        tmp_path / "src",
+        ignore=shutil.ignore_patterns("__pycache__", "*.so", "*.c"),
+    )
+
+    build = subprocess.run(
+        [sys.executable, "setup.py", "build_ext", "--inplace"],
+        cwd=tmp_path,
+        env={**os.environ, "HOUSING_CYTHONIZE": "1"},
+        capture_output=True,
+        text=True,
+        timeout=600,
+    )
+    assert build.returncode == 0, build.stderr[-2000:]
+
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_CHECK],
+        cwd=tmp_path / "src",
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
@@ -0,0 +1,129 @@
+"""
+Tests for the model evaluation module
+"""
+
+import sys
+from pathlib import Path
+
+import mlflow
+import numpy as np
+import pytest
+from sklearn import metrics as skm
+from sklearn.dummy import DummyRegressor
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from models import evaluate_model
+
+
+@pytest.fixture
+def local_registry(tmp_path, monkeypatch):
+    """Run in an empty directory whose ./mlruns is the tracking store"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("MLFLOW_TRACKING_URI", raising=False)
+    evaluate_model._cached_model_loader.cache_clear()
+    yield tmp_path / "mlruns"
+    evaluate_model._cached_model_loader.cache_clear()
+    mlflow.set_tracking_uri(None)
+
+
+def register_constant_model(store, value):
+    """Register a model predicting a constant under the configured model name"""
+    config = evaluate_model.load_config()
+    model_name = config["mlflow"]["model_registry"]["registered_model_name"]
+    model = DummyRegressor(strategy="constant", constant=value)
+    model.fit(np.zeros((2, 8)), np.zeros(2))
+
+    mlflow.set_tracking_uri(store.as_uri())
+    with mlflow.start_run():
+        mlflow.sklearn.log_model(model, "model", registered_model_name=model_name)
+
+
+class TestCalculateRegressionMetrics:
+    """Test the single-pass metrics against sklearn's metric functions"""
+
+    @pytest.mark.parametrize("n", [1, 2, 7, 1000])
+    def test_matches_sklearn(self, n):
+        """Every metric agrees with sklearn on random predictions"""
+        rng = np.random.default_rng(n)
+        y_true = rng.uniform(0.5, 5.0, n)
+        y_pred = y_true + rng.normal(0.0, 0.3, n)
+        residuals = y_true - y_pred
+
+        metrics = evaluate_model.calculate_regression_metrics(y_true, y_pred)
+
+        expected = {
+            "mae": skm.mean_absolute_error(y_true, y_pred),
+            "mse": skm.mean_squared_error(y_true, y_pred),
+            "rmse": np.sqrt(skm.mean_squared_error(y_true, y_pred)),
+            "explained_variance": skm.explained_variance_score(y_true, y_pred),
+            "mape": skm.mean_absolute_percentage_error(y_true, y_pred) * 100,
+            "mean_residual": np.mean(residuals),
+            "std_residual": np.std(residuals),
+            "max_residual": skm.max_error(y_true, y_pred),
+            "median_residual": skm.median_absolute_error(y_true, y_pred),
+        }
+        # sklearn leaves R² undefined (NaN) for a single sample
+        if n > 1:
+            expected["r2_score"] = skm.r2_score(y_true, y_pred)
+
+        for name, value in expected.items():
+            assert metrics[name] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+    def test_constant_target(self):
+        """R² and explained variance follow sklearn for a constant target"""
+        y_true = np.full(7, 2.0)
+        y_pred = np.linspace(1.0, 3.0, 7)
+
+        metrics = evaluate_model.calculate_regression_metrics(y_true, y_pred)
+        assert metrics["r2_score"] == skm.r2_score(y_true, y_pred)
+        assert metrics["explained_variance"] == skm.explained_variance_score(
+            y_true, y_pred
+        )
+
+    def test_rejects_empty_or_mismatched_inputs(self):
+        """Empty and differently sized inputs raise ValueError"""
+        with pytest.raises(ValueError):
+            evaluate_model.calculate_regression_metrics([], [])
+        with pytest.raises(ValueError):
+            evaluate_model.calculate_regression_metrics([1.0, 2.0], [1.0])
+
+
+class TestLoadBestModel:
+    """Test loading the registered model through the local model cache"""
+
+    def test_rebuilt_registry_does_not_return_cached_model(self, local_registry):
+        """A new version 1 after mlruns is rebuilt is loaded, not the cached one"""
+        register_constant_model(local_registry, 1.0)
+        model, model_info = evaluate_model.load_best_model()
+        assert str(model_info["version"]) == "1"
+        assert model.predict(np.zeros((1, 8)))[0] == 1.0
+
+        # Numbering restarts at 1 once the registered model is gone, as it
+        # does when dvc repro deletes mlruns
+        mlflow.MlflowClient().delete_registered_model(model_info["name"])
+        register_constant_model(local_registry, 2.0)
+        model, model_info = evaluate_model.load_best_model()
+        assert str(model_info["version"]) == "1"
+        assert model.predict(np.zeros((1, 8)))[0] == 2.0
+
+    def test_versions_without_run_are_not_cached(self, local_registry, tmp_path):
+        """Versions registered without a run each load their own model"""
+        config = evaluate_model.load_config()
+        model_name = config["mlflow"]["model_registry"]["registered_model_name"]
+        mlflow.set_tracking_uri(local_registry.as_uri())
+        client = mlflow.MlflowClient()
+        client.create_registered_model(model_name)
+
+        for value in (1.0, 2.0):
+            model = DummyRegressor(strategy="constant", constant=value)
+            model.fit(np.zeros((2, 8)), np.zeros(2))
+            source = tmp_path / f"external_{value:g}"
+            mlflow.sklearn.save_model(model, source)
+            version = client.create_model_version(model_name, str(source), run_id=None)
+
+            model = evaluate_model.load_mlflow_model(
+                f"models:/{model_name}/{version.version}", version.run_id
+            )
+            assert model.predict(np.zeros((1, 8)))[0] == value
@@ -0,0 +1,48 @@
+"""
+Tests for the data loading module
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from data.load_data import get_data_summary
+
+
+class TestGetDataSummary:
+    """Test the summary statistics against pandas' describe()"""
+
+    def test_matches_describe(self, sample_housing_data):
+        """Summary statistics equal describe() for every numeric column"""
+        data = sample_housing_data.copy()
+        data.loc[0, "MedInc"] = np.nan
+
+        summary = get_data_summary(data)
+
+        expected = data.describe().to_dict()
+        assert summary["summary_stats"].keys() == expected.keys()
+        for column, stats in expected.items():
+            for name, value in stats.items():
+                result = summary["summary_stats"][column][name]
+                assert result == pytest.approx(value), (column, name)
+        assert summary["missing_values"]["MedInc"] == 1
+
+    def test_empty_frame(self, sample_housing_data):
+        """An empty frame reports count 0 and NaN statistics, as describe() does"""
+        data = sample_housing_data.iloc[:0]
+
+        summary = get_data_summary(data)
+
+        expected = data.describe().to_dict()
+        assert summary["summary_stats"].keys() == expected.keys()
+        for column, stats in expected.items():
+            assert summary["summary_stats"][column]["count"] == 0
+            for name, value in stats.items():
+                result = summary["summary_stats"][column][name]
+                assert result == value or (np.isnan(result) and np.isnan(value))
+        assert summary["shape"] == (0, data.shape[1])
@@ -0,0 +1,125 @@
+"""
+Smoke tests for the model training pipeline
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn import metrics as skm
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from models import train_model
+
+TRAIN_SCRIPT = Path(__file__).parent.parent / "src" / "models" / "train_model.py"
+
+
+@pytest.fixture
+def training_workdir(tmp_path, sample_housing_data):
+    """A working directory holding tiny processed train/validation/test CSVs"""
+    processed_path = tmp_path / "data" / "processed"
+    processed_path.mkdir(parents=True)
+
+    data = sample_housing_data.rename(columns={"MedHouseVal": "median_house_value"})
+    data.iloc[:60].to_csv(processed_path / "train.csv", index=False)
+    data.iloc[60:80].to_csv(processed_path / "validation.csv", index=False)
+    data.iloc[80:].to_csv(processed_path / "test.csv", index=False)
+
+    return tmp_path
+
+
+@pytest.mark.slow
+def test_train_script_trains_every_model(training_workdir):
+    """Run main() through the script entry point, as the DVC stage does"""
+    # Track into the working directory's ./mlruns, not a configured server
+    env = {k: v for k, v in os.environ.items() if k != "MLFLOW_TRACKING_URI"}
+
+    result = subprocess.run(
+        [sys.executable, str(TRAIN_SCRIPT)],
+        cwd=training_workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=600,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    # A trainer that fails is logged and skipped, so check each one reported
+    metrics = json.loads((training_workdir / "metrics.json").read_text())
+    for model_key in (
+        "linear_regression",
+        "ridge_regression",
+        "random_forest",
+        "decision_tree",
+    ):
+        assert metrics[model_key]["val_rmse"] >= 0
+    assert metrics["best_model"]["name"]
+
+
+def test_read_split_reparses_csv_restored_with_older_mtime(
+    tmp_path, monkeypatch, sample_housing_data
+):
+    """The Parquet copy is only reused for the exact CSV it was made from"""
+    monkeypatch.chdir(tmp_path)
+    csv_path = tmp_path / "train.csv"
+    data = sample_housing_data.rename(columns={"MedHouseVal": "median_house_value"})
+
+    data.iloc[:60].to_csv(csv_path, index=False)
+    assert len(train_model._read_split(csv_path)) == 60
+    assert (tmp_path / train_model.SPLIT_CACHE_DIR / "train.parquet").exists()
+    # A second read of the unchanged CSV comes from the Parquet copy
+    assert len(train_model._read_split(csv_path)) == 60
+
+    # Bring back a different CSV whose mtime is older than the Parquet copy,
+    # as dvc checkout or cp -p can
+    mtime = csv_path.stat().st_mtime
+    data.iloc[:40].to_csv(csv_path, index=False)
+    os.utime(csv_path, (mtime - 3600, mtime - 3600))
+    split = train_model._read_split(csv_path)
+    assert len(split) == 40
+    assert (split.dtypes == "float32").all()
+
+
+@pytest.mark.parametrize("n", [2, 7, 1000])
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_regression_metrics_match_sklearn(n, dtype):
+    """RMSE, MAE and R² agree with sklearn, for float32 targets as well"""
+    rng = np.random.default_rng(n)
+    y_true = rng.uniform(0.5, 5.0, n).astype(dtype)
+    y_pred = (y_true + rng.normal(0.0, 0.3, n)).astype(dtype)
+
+    rmse, mae, r2 = train_model.regression_metrics(y_true, y_pred)
+
+    y_true, y_pred = y_true.astype(np.float64), y_pred.astype(np.float64)
+    assert rmse == pytest.approx(np.sqrt(skm.mean_squared_error(y_true, y_pred)))
+    assert mae == pytest.approx(skm.mean_absolute_error(y_true, y_pred))
+    assert r2 == pytest.approx(skm.r2_score(y_true, y_pred))
+
+
+def test_prune_sklearn_cache(tmp_path, monkeypatch):
+    """Stale scikit-learn versions are dropped and the cache is trimmed"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(train_model, "SKLEARN_CACHE_BYTES_LIMIT", "1M")
+    stale = Path(train_model.SKLEARN_CACHE_DIR) / "sklearn-0.0.1"
+    stale.mkdir(parents=True)
+    (Path(train_model.SKLEARN_CACHE_DIR) / "joblib").mkdir()
+
+    # Three ~400 KB cached results; only the two most recent fit under 1 MB
+    store = train_model._sklearn_memory().cache(np.ones)
+    for n in (50_000, 50_001, 50_002):
+        store(n)
+
+    train_model.prune_sklearn_cache()
+
+    cache_dir = Path(train_model.SKLEARN_CACHE_DIR)
+    assert [path.name for path in cache_dir.iterdir()] == [
+        f"sklearn-{train_model.sklearn.__version__}"
+    ]
+    size = sum(f.stat().st_size for f in cache_dir.rglob("*") if f.is_file())
+    assert 0 < size <= 1024 * 1024